@@ -0,0 +1,80 @@
+"""Memory benchmark: serving a large file by path vs. reading it into bytes.
+
+Compares today's ``fl.read()`` hand-off to ``st.download_button`` with the
+file server in tools/delivery.py, which streams from disk with sendfile.
+Reports Python heap peak (tracemalloc) and RSS growth for each path.
+
+    python benchmarks/delivery.py [size_mb]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tools.delivery import FileServer
+
+
+def rss_mb():
+    # Current RSS from /proc where available, else peak RSS
+    try:
+        with open("/proc/self/statm") as fl: return int(fl.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(label, fn):
+    rss0 = rss_mb()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    keep = fn()
+    dt = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28}{dt:>10.2f}{peak / 2**20:>16.1f}{rss_mb() - rss0:>14.1f}")
+    return keep
+
+
+def main(size_mb=256):
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    chunk = os.urandom(2**20)
+    with os.fdopen(fd, "wb") as fl:
+        for _ in range(size_mb): fl.write(chunk)
+    server = FileServer()
+    try:
+        print(f"File: {size_mb} MB")
+        print(f"{'Path':<28}{'seconds':>10}{'heap peak (MB)':>16}{'+RSS (MB)':>14}")
+
+        def read_all():
+            with open(path, "rb") as fl: return fl.read()  # what download_button receives today
+
+        def serve():
+            # Client reads in chunks and discards, like a browser writing to disk
+            with urllib.request.urlopen(server.url(path)) as resp:
+                got = 0
+                while True:
+                    b = resp.read(2**20)
+                    if not b: break
+                    got += len(b)
+            assert got == size_mb * 2**20
+            return None
+
+        data = measure("fl.read() -> bytes", read_all)
+        del data
+        measure("file server (sendfile)", serve)
+
+        req = urllib.request.Request(server.url(path), headers={"Range": "bytes=100-199"})
+        with urllib.request.urlopen(req) as resp:
+            print(f"Range check: HTTP {resp.status}, {resp.headers['Content-Range']}, {len(resp.read())} bytes")
+    finally:
+        server.close()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 256)
@@ -0,0 +1,48 @@
+"""Cold-start benchmark: import time and RSS per tool module.
+
+Each tool is imported in a fresh interpreter so its cost is measured in
+isolation. Numbers are reported relative to a bare ``import streamlit``,
+which every tool pays anyway.
+
+    python benchmarks/startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tools import TOOLS
+
+PROBE = """
+import json, resource, sys, time
+import streamlit
+t0 = time.perf_counter()
+if sys.argv[1]:
+    import importlib; importlib.import_module(sys.argv[1])
+dt = time.perf_counter() - t0
+# ru_maxrss is KiB on Linux, bytes on macOS
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin": rss //= 1024
+print(json.dumps({"import_s": dt, "rss_kb": rss}))
+"""
+
+
+def probe(module=""):
+    out = subprocess.run([sys.executable, "-c", PROBE, module], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    base = probe()
+    print(f"{'Tool':<20}{'import (ms)':>14}{'RSS (MB)':>12}{'+RSS (MB)':>12}")
+    print(f"{'(streamlit only)':<20}{0:>14.1f}{base['rss_kb'] / 1024:>12.1f}{0:>12.1f}")
+    for name, mod in TOOLS.items():
+        r = probe(f"tools.{mod}")
+        print(f"{name:<20}{r['import_s'] * 1000:>14.1f}{r['rss_kb'] / 1024:>12.1f}{(r['rss_kb'] - base['rss_kb']) / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
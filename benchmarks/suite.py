@@ -0,0 +1,525 @@
+"""Headless benchmark suite: drives every tool through ``streamlit.testing.v1.AppTest``.
+
+Each scenario opens a tool from the sidebar of the real app.py and replays a
+few interactions, timing every rerun. Every scenario runs in fresh
+subprocesses (``--repeat`` of them, 3 by default). Each subprocess first
+opens every tool once so library imports are warm, then clears the caches.
+So a scenario measures the same thing whether it runs alone (``--only``) or
+after others. Reported per scenario:
+
+- cold_ms: the rerun that first renders the tool with its inputs (median
+  over repeats; imports are already warm, caches are not);
+- p50_ms / max_ms: the interaction reruns after that, pooled over all
+  repeats; p95_ms: the median of each repeat's p95, so one slow process
+  can't make the tail;
+- peak_mb: tracemalloc peak over the scenario (Python allocations), median
+  over repeats;
+- rss_mb: growth of the process's peak RSS over the scenario, which also
+  counts image buffers and other native memory (Linux only), median over
+  repeats.
+
+Nothing touches the network. AppTest cannot upload files, so the app is run
+by a driver that patches ``st.file_uploader`` to return synthetic files
+(images, PDFs). Weather talks to the stub API in tools.weather_client,
+yt-dlp is replaced by a fake extractor, and the meme template download cache
+is pre-seeded. Background Eraser is skipped: it needs a downloaded rembg
+model. Everything the app writes goes to a temp working directory.
+
+Results are compared against a stored baseline (benchmarks/baseline.json by
+default). A metric regresses when it is more than ``--tolerance`` above the
+baseline and also beyond that metric's noise floor. Each subprocess also
+times a fixed CPU-bound workload (calib_ms) around its scenario, and baseline
+latencies are scaled by the ratio of the two calibrations, so a machine that
+is uniformly slower or faster than when the baseline was saved doesn't read
+as a regression. For latencies the floor
+is the baseline's own spread (p95 - p50) or 10 ms, whichever is larger; for
+memory it is 10% of the baseline or 1 MB (10 MB for RSS). Latency is judged
+on p50 and p95. A scenario that looks regressed is measured again in fresh
+processes, and only counts if the regression shows up again; any confirmed
+regression makes the exit code 1. Baselines are
+machine-specific, so refresh one with ``--save`` on the machine that runs
+the comparison.
+
+    python benchmarks/suite.py [--only photo] [--repeat 3] [--save] [--baseline PATH] [--tolerance 0.3]
+"""
+import argparse
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+APP = os.path.join(ROOT, "app.py")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+NOISE_MS, NOISE_MB, NOISE_RSS_MB = 10.0, 1.0, 10.0
+NOISE_MEM_FRACTION = 0.1
+
+
+def _status_mb(field):
+    try:
+        with open("/proc/self/status") as fl:
+            for line in fl:
+                if line.startswith(field + ":"): return int(line.split()[1]) / 1024
+    except OSError: pass
+    return None
+
+
+def reset_rss_peak():
+    """Reset the kernel's peak-RSS mark (VmHWM) so it can be read per scenario; False if unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as fl: fl.write("5")
+        return True
+    except OSError: return False
+
+
+# --- Local stubs ---
+
+class StubYDL:
+    """Stands in for ``yt_dlp.YoutubeDL``: writes a small file and reports progress."""
+
+    def __init__(self, opts): self.opts = opts
+    def __enter__(self): return self
+    def __exit__(self, *exc): pass
+
+    def extract_info(self, url, download=True):
+        path = self.opts["outtmpl"].replace("%(title)s", url.rstrip("/").rsplit("/", 1)[-1]).replace("%(ext)s", "mp4")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        total = 2_000_000
+        with open(path, "wb") as fl:
+            for k in range(4):
+                fl.write(b"\0" * (total // 4))
+                for hook in self.opts["progress_hooks"]:
+                    hook({"status": "downloading", "downloaded_bytes": (k + 1) * total // 4, "total_bytes": total, "speed": 5e7})
+        return {"title": url, "ext": "mp4", "requested_downloads": [{"filepath": path}]}
+
+    def prepare_filename(self, info): return None
+
+
+def prepare_environment(workdir):
+    """Point every tool at local data and stubs; must run before the tools are imported."""
+    os.chdir(workdir)
+    os.environ.update({"EXPENSES_DB": os.path.join(workdir, "expenses.db"),
+                       "NOTES_DB": os.path.join(workdir, "notes.db"),
+                       "MEME_CACHE_DIR": os.path.join(workdir, "memes")})
+    for key in ("INSTRUMENT", "DELIVERY_PORT", "OPENWEATHER_API_KEY"): os.environ.pop(key, None)
+    from tools.weather_client import StubServer
+    stub = StubServer()
+    os.environ["WEATHER_BASE_URL"] = stub.base_url
+    sys.modules["yt_dlp"] = types.SimpleNamespace(YoutubeDL=StubYDL)
+    from PIL import Image
+    from tools import meme_templates
+    os.makedirs(meme_templates.CACHE_DIR, exist_ok=True)
+    for url in meme_templates.TEMPLATES.values():
+        Image.new("RGB", (800, 800), "gray").save(meme_templates._cache_path(url), "JPEG")
+    return stub
+
+
+# --- Synthetic inputs ---
+
+def make_image(w, h):
+    from PIL import Image
+    img = Image.merge("RGB", [Image.effect_noise((w, h), 40 + 20 * k) for k in range(3)])
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+def make_pdf(pages):
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.set_font("Arial", "", 11)
+    rnd = random.Random(pages)
+    words = "invoice ledger quarterly revenue forecast margin audit vendor contract budget".split()
+    for p in range(pages):
+        pdf.add_page()
+        pdf.multi_cell(0, 5, f"Page {p + 1}\n" + " ".join(rnd.choice(words) for _ in range(400)))
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def seed_expenses(n):
+    from tools.expense_store import ExpenseStore
+    rnd = random.Random(n)
+    store = ExpenseStore(os.environ["EXPENSES_DB"])
+    store.clear()
+    cats = ["Food", "Travel", "Bills", "Health"]
+    store.add_many((f"{2020 + rnd.randrange(5)}-{rnd.randrange(1, 13):02d}-{rnd.randrange(1, 29):02d}",
+                    f"item {i}", rnd.choice(cats), round(rnd.uniform(1, 200), 2)) for i in range(n))
+
+
+def seed_notes(n):
+    from tools.notes_store import NotesStore
+    rnd = random.Random(n)
+    store = NotesStore(os.environ["NOTES_DB"])
+    store.clear()
+    words = "call email draft review meeting budget groceries idea travel invoice follow up plan".split()
+    tags = ["work", "home", "ideas", "todo"]
+    store.add_many((" ".join(rnd.choice(words) for _ in range(rnd.randrange(5, 60))), rnd.sample(tags, rnd.randrange(3)),
+                    f"{2020 + rnd.randrange(5)}-{rnd.randrange(1, 13):02d}-{rnd.randrange(1, 29):02d}T12:00:00+00:00")
+                   for _ in range(n))
+
+
+# --- Driver ---
+
+def _driver(app_path, uploads):
+    # ``uploads`` is the Run's own list, filled once the scenario's tool is open
+    import runpy
+    import streamlit as st
+    from streamlit.proto.Common_pb2 import FileURLs
+    from streamlit.runtime.uploaded_file_manager import UploadedFile, UploadedFileRec
+
+    def file_uploader(label, type=None, accept_multiple_files=False, **kwargs):
+        files = [UploadedFile(UploadedFileRec(f"bench-{i}", name, mime, data), FileURLs())
+                 for i, (name, mime, data) in enumerate(uploads)]
+        if accept_multiple_files: return files or None
+        return files[0] if files else None
+
+    st.file_uploader = file_uploader
+    runpy.run_path(app_path, run_name="__main__")
+
+
+def by_label(elements, label):
+    for e in elements:
+        if e.label == label or e.label.startswith(label): return e
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+class Run:
+    """One scenario's AppTest plus its timings and memory peak.
+
+    Created after the scenario's inputs are built, so the peak only covers
+    the app itself.
+    """
+
+    def __init__(self, tool, uploads=()):
+        from streamlit.testing.v1 import AppTest
+        from tools import SUITES
+        self.tool, self.files, self.uploads = tool, list(uploads), []
+        self.suite = next(s for s, (_, names) in SUITES.items() if tool in names)
+        self.at = AppTest.from_function(_driver, kwargs={"app_path": APP, "uploads": self.uploads}, default_timeout=300)
+        self.cold, self.times = None, []
+        tracemalloc.reset_peak()
+        self.mem0 = tracemalloc.get_traced_memory()[0]
+        self.rss0 = _status_mb("VmRSS") if reset_rss_peak() else None
+
+    @property
+    def peak_mb(self):
+        return (tracemalloc.get_traced_memory()[1] - self.mem0) / 2**20
+
+    @property
+    def rss_mb(self):
+        return None if self.rss0 is None else _status_mb("VmHWM") - self.rss0
+
+    def rerun(self, action=None):
+        if action: action(self.at)
+        t0 = time.perf_counter()
+        self.at.run()
+        dt = time.perf_counter() - t0
+        if self.at.exception: raise RuntimeError(self.at.exception[0].value)
+        if self.cold is None: self.cold = dt
+        else: self.times.append(dt)
+        return self.at
+
+    def open(self):
+        for action in (None, lambda at: at.sidebar.selectbox[0].set_value(self.suite)):
+            if action: action(self.at)
+            if self.at.run().exception: raise RuntimeError(self.at.exception[0].value)
+        # Files only appear once this tool is selected, not in whichever tool loads first
+        self.uploads.extend(self.files)
+        return self.rerun(lambda at: at.sidebar.radio[0].set_value(self.tool))
+
+
+# --- Scenarios ---
+
+def photo(size):
+    w, h = size
+    def scenario():
+        r = Run("Photo Enhancer", [(f"synthetic_{w}x{h}.jpg", "image/jpeg", make_image(w, h))])
+        r.open()
+        r.rerun(lambda at: at.multiselect[0].set_value(["Sepia", "Contrast", "Blur"]))
+        for v in (0.6, 1.4, 1.8): r.rerun(lambda at, v=v: at.slider(key="pe_Contrast").set_value(v))
+        for v in (3, 6): r.rerun(lambda at, v=v: at.slider(key="pe_Blur").set_value(v))
+        r.rerun(lambda at: at.multiselect[0].set_value(["Grayscale", "Invert"]))
+        return r
+    return scenario
+
+
+def expenses(rows):
+    def scenario():
+        seed_expenses(rows)
+        r = Run("Expenses")
+        r.open()
+        for page in (2, 50, rows // 50, 1): r.rerun(lambda at, p=page: by_label(at.number_input, "Page").set_value(p))
+        r.rerun(lambda at: by_label(at.number_input, "Monthly Budget").set_value(2500.0))
+        return r
+    return scenario
+
+
+def notes(n):
+    def scenario():
+        seed_notes(n)
+        r = Run("Quick Notes")
+        r.open()
+        for page in (2, n // 40, 1): r.rerun(lambda at, p=page: by_label(at.number_input, "Page").set_value(p))
+        r.rerun(lambda at: by_label(at.text_input, "🔍 Search").set_value("budget trav"))
+        r.rerun(lambda at: by_label(at.selectbox, "Tag").set_value("todo"))
+        r.rerun(lambda at: by_label(at.text_input, "🔍 Search").set_value(""))
+        return r
+    return scenario
+
+
+def pdf(pages):
+    def scenario():
+        r = Run("PDF Tools", [(f"synthetic_{pages}p.pdf", "application/pdf", make_pdf(pages))])
+        r.open()
+        r.rerun(lambda at: by_label(at.button, "Extract Text").click())
+        for v in (2, 10, 1): r.rerun(lambda at, v=v: by_label(at.number_input, "View").set_value(v))
+        r.rerun(lambda at: by_label(at.radio, "Tool").set_value("Search"))
+        for q in ("quarterly", "audit vendor", "margin"): r.rerun(lambda at, q=q: by_label(at.text_input, "Search").input(q))
+        return r
+    return scenario
+
+
+def qr():
+    r = Run("QR Generator")
+    r.open()
+    for k in range(6):
+        r.rerun(lambda at, k=k: by_label(at.text_input, "Content").input(f"https://example.com/item/{k % 3}"))
+        r.rerun(lambda at: by_label(at.button, "Generate").click())
+    return r
+
+
+def resume():
+    r = Run("Resume Builder")
+    r.open()
+    r.rerun(lambda at: by_label(at.number_input, "Experience entries").set_value(3))
+    for name in ("Zoë Łukasiewicz", "Ana García", "Zoë Łukasiewicz"):
+        r.rerun(lambda at, n=name: (by_label(at.text_input, "Full Name").input(n), by_label(at.button, "📄 Generate").click()))
+    return r
+
+
+def weather():
+    r = Run("Weather")
+    r.open()
+    for city in ("London", "Paris", "London"):
+        r.rerun(lambda at, c=city: (by_label(at.text_input, "City").input(c), by_label(at.button, "Check Weather").click()))
+    r.rerun(lambda at: by_label(at.radio, "Mode").set_value("Compare Cities"))
+    for _ in range(2): r.rerun(lambda at: by_label(at.button, "Compare").click())
+    return r
+
+
+def meme():
+    r = Run("Meme Creator")
+    r.open()
+    for text in ("WHEN THE BENCHMARK", "RUNS OFFLINE", "AND NOTHING REGRESSES"):
+        r.rerun(lambda at, t=text: by_label(at.text_input, "Top Text").input(t))
+    r.rerun(lambda at: by_label(at.selectbox, "Template").set_value("Blank White"))
+    return r
+
+
+def video():
+    r = Run("Video Downloader")
+    r.open()
+    r.rerun(lambda at: (by_label(at.text_input, "YouTube URL").input("https://example.com/clip"), by_label(at.button, "Download").click()))
+    for _ in range(4):
+        time.sleep(0.2)
+        r.rerun()
+    return r
+
+
+def idle(tool, interact=None):
+    def scenario():
+        r = Run(tool)
+        r.open()
+        for k in range(5): r.rerun(interact and (lambda at, k=k: interact(at, k)))
+        return r
+    return scenario
+
+
+SCENARIOS = {
+    "photo-640x480": photo((640, 480)),
+    "photo-1920x1080": photo((1920, 1080)),
+    "photo-4000x3000": photo((4000, 3000)),
+    "expenses-10k": expenses(10_000),
+    "expenses-200k": expenses(200_000),
+    "pdf-20p": pdf(20),
+    "pdf-200p": pdf(200),
+    "qr": qr,
+    "resume": resume,
+    "weather": weather,
+    "meme": meme,
+    "video": video,
+    "bmi": idle("BMI Calculator", lambda at, k: by_label(at.number_input, "Weight").set_value(60.0 + k)),
+    "health-journal": idle("Health Journal", lambda at, k: by_label(at.slider, "Cycle Length").set_value(24 + k)),
+    "notes-1k": notes(1_000),
+    "notes-50k": notes(50_000),
+}
+
+
+def calibrate(rounds=5):
+    """Median milliseconds for a fixed CPU-bound workload: how fast this machine is right now."""
+    times = []
+    for _ in range(rounds):
+        rnd = random.Random(0)
+        t0 = time.perf_counter()
+        data = sorted(rnd.random() for _ in range(100_000))
+        json.dumps(data[::4])
+        times.append((time.perf_counter() - t0) * 1000)
+    return percentile(times, 0.5)
+
+
+def warm_up():
+    """Open every tool once, so imports aren't charged to the first scenario, then drop what that cached."""
+    import gc
+    import streamlit as st
+    from tools import SUITES
+    for _, names in SUITES.values():
+        for tool in names:
+            if tool != "Background Eraser": Run(tool).open()
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    for mod_name, mod in list(sys.modules.items()):
+        if not mod_name.startswith("tools.") or mod is None: continue
+        for fn in list(vars(mod).values()):
+            if callable(getattr(fn, "cache_clear", None)) and getattr(fn, "__module__", None) == mod_name: fn.cache_clear()
+    gc.collect()
+
+
+# --- Reporting ---
+
+def percentile(values, q):
+    if not values: return 0.0
+    data = sorted(values)
+    return data[min(len(data) - 1, int(q * len(data)))]
+
+
+def median(values):
+    values = [v for v in values if v is not None]
+    return percentile(values, 0.5) if values else None
+
+
+def run_child(name):
+    """One measured run of ``name`` in this (fresh) process; prints a RESULT line for the parent."""
+    workdir = tempfile.mkdtemp(prefix="app_bench_")
+    stub = prepare_environment(workdir)
+    try:
+        warm_up()
+        calib = calibrate()
+        tracemalloc.start()
+        r = SCENARIOS[name]()
+        raw = {"cold_ms": r.cold * 1000, "times_ms": [t * 1000 for t in r.times], "peak_mb": r.peak_mb, "rss_mb": r.rss_mb}
+        tracemalloc.stop()
+        raw["calib_ms"] = (calib + calibrate()) / 2
+    except Exception as e:
+        raw = {"error": f"{type(e).__name__}: {e}"}
+    finally: stub.close()
+    print("RESULT " + json.dumps(raw), flush=True)
+
+
+def sample(name):
+    """Run scenario ``name`` in a subprocess and return its raw result."""
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name], capture_output=True, text=True)
+    lines = [ln for ln in proc.stdout.splitlines() if ln.startswith("RESULT ")]
+    if not lines:
+        tail = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        return {"error": f"exit {proc.returncode}: {tail}"}
+    return json.loads(lines[-1][len("RESULT "):])
+
+
+def measure(name, repeat):
+    samples = [sample(name) for _ in range(repeat)]
+    errors = [s["error"] for s in samples if "error" in s]
+    if errors: return {"error": errors[0]}
+    ms = [t for s in samples for t in s["times_ms"]]
+    rss = median([s["rss_mb"] for s in samples])
+    return {"runs": repeat, "reruns": len(ms) + repeat, "calib_ms": round(median([s["calib_ms"] for s in samples]), 1), "cold_ms": round(median([s["cold_ms"] for s in samples]), 1),
+            "p50_ms": round(percentile(ms, 0.5), 1), "p95_ms": round(median([percentile(s["times_ms"], 0.95) for s in samples]), 1),
+            "max_ms": round(max(ms, default=0.0), 1), "peak_mb": round(median([s["peak_mb"] for s in samples]), 1),
+            "rss_mb": None if rss is None else round(rss, 1)}
+
+
+def noise_floor(metric, base):
+    if metric.endswith("_ms"): return max(NOISE_MS, base.get("p95_ms", 0) - base.get("p50_ms", 0))
+    return max(NOISE_RSS_MB if metric == "rss_mb" else NOISE_MB, NOISE_MEM_FRACTION * base[metric])
+
+
+def scaled(cur, base):
+    """``base`` with its latencies scaled to the machine speed ``cur`` was measured at."""
+    if not cur.get("calib_ms") or not base.get("calib_ms"): return base
+    k = cur["calib_ms"] / base["calib_ms"]
+    return {m: round(v * k, 1) if m.endswith("_ms") and m != "calib_ms" else v for m, v in base.items()}
+
+
+def compare(results, baseline, tolerance):
+    """[(scenario, metric, baseline, current)] for every regression; baseline latencies are speed-scaled."""
+    out = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base or "error" in cur or "error" in base: continue
+        base = scaled(cur, base)
+        for metric in ("p50_ms", "p95_ms", "peak_mb", "rss_mb"):
+            if cur.get(metric) is None or base.get(metric) is None: continue
+            if cur[metric] > base[metric] * (1 + tolerance) and cur[metric] - base[metric] > noise_floor(metric, base):
+                out.append((name, metric, base[metric], cur[metric]))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--only", help="run scenarios whose name contains this")
+    ap.add_argument("--repeat", type=int, default=3, help="fresh processes per scenario; samples are pooled")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE)
+    ap.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.3)
+    ap.add_argument("--json", help="also write the results to this file")
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child: return run_child(args.child)
+
+    baseline = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline) as fl: baseline = json.load(fl).get("scenarios", {})
+
+    print(f"{'Scenario':<20}{'cold ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'peak MB':>9}{'RSS MB':>9}{'p95 vs base':>13}")
+    results = {}
+    for name in SCENARIOS:
+        if args.only and args.only not in name: continue
+        res = results[name] = measure(name, max(1, args.repeat))
+        if "error" in res:
+            print(f"{name:<20}  ERROR {res['error']}")
+            continue
+        base = scaled(res, baseline[name]).get("p95_ms") if name in baseline else None
+        delta = f"{(res['p95_ms'] / base - 1) * 100:+.0f}%" if base else "-"
+        print(f"{name:<20}{res['cold_ms']:>10.1f}{res['p50_ms']:>9.1f}{res['p95_ms']:>9.1f}{res['max_ms']:>9.1f}{res['peak_mb']:>9.1f}{'-' if res['rss_mb'] is None else res['rss_mb']:>9}{delta:>13}")
+
+    report = {"python": sys.version.split()[0], "cpus": os.cpu_count(), "scenarios": results}
+    if args.json:
+        with open(args.json, "w") as fl: json.dump(report, fl, indent=2)
+    if args.save:
+        if os.path.isfile(args.baseline):
+            # Keep baseline entries for scenarios that were not run this time
+            with open(args.baseline) as fl: report["scenarios"] = {**json.load(fl).get("scenarios", {}), **results}
+        with open(args.baseline, "w") as fl: json.dump(report, fl, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        # One noisy stretch shouldn't fail the run: a regression has to reproduce
+        suspects = sorted({name for name, *_ in regressions})
+        print(f"\nRe-checking {', '.join(suspects)}")
+        recheck = {name: measure(name, max(1, args.repeat)) for name in suspects}
+        regressions = compare(recheck, baseline, args.tolerance)
+    for name, metric, old, new in regressions:
+        print(f"REGRESSION {name}: {metric} {old} -> {new}")
+    failed = [n for n, r in results.items() if "error" in r]
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
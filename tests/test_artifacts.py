@@ -0,0 +1,28 @@
+"""prune_dir age/size limits (the rest of tools.artifacts needs a Streamlit session)."""
+import os
+import time
+
+from tools.artifacts import prune_dir
+
+
+def test_prune_keeps_recent_and_kept_files(tmp_path):
+    old, busy, fresh = tmp_path / "old", tmp_path / "busy", tmp_path / "fresh"
+    for d in (old, busy, fresh): d.mkdir()
+    for d in (old, busy):
+        (d / "result.zip").write_bytes(b"\0" * 1024)
+        os.utime(d / "result.zip", (0, 0))
+    (fresh / "result.zip").write_bytes(b"\0" * 1024)
+
+    # Over budget, but the file still being written and the kept folder stay
+    assert prune_dir(str(tmp_path), max_age_s=3600, max_bytes=0, keep=[str(busy)], min_age_s=60) == 1
+    assert not (old / "result.zip").exists() and (busy / "result.zip").exists() and (fresh / "result.zip").exists()
+
+    past = time.time() - 120
+    os.utime(fresh / "result.zip", (past, past))
+    assert prune_dir(str(tmp_path), max_bytes=0, min_age_s=60) == 2
+    assert not any(tmp_path.glob("*/*"))
+
+    # Emptied folders go once they are old enough too
+    for d in (old, busy, fresh): os.utime(d, (past, past))
+    prune_dir(str(tmp_path), min_age_s=60)
+    assert not any(tmp_path.iterdir())
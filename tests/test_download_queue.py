@@ -0,0 +1,76 @@
+"""DownloadQueue against a local stub extractor (no network, no yt-dlp)."""
+import os
+import threading
+import time
+
+from tools.download_queue import DownloadQueue
+
+
+class StubExtractor:
+    """Writes ``size`` bytes to a ``.part`` file, waits for ``release``, then renames it."""
+
+    def __init__(self, opts, size=3 * 2**20, started=None, release=None):
+        self.opts, self.size, self.started, self.release = opts, size, started, release
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): return False
+
+    def prepare_filename(self, info):
+        return self.opts["outtmpl"] % info
+
+    def extract_info(self, url, download=True):
+        info = {"title": url.rsplit("/", 1)[-1], "ext": "mp4"}
+        path = self.prepare_filename(info)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".part", "wb") as fl: fl.write(b"\0" * self.size)
+        for hook in self.opts["progress_hooks"]: hook({"downloaded_bytes": self.size, "total_bytes": 2 * self.size})
+        self.started.set()
+        self.release.wait(10)
+        with open(path + ".part", "ab") as fl: fl.write(b"\0" * self.size)
+        os.replace(path + ".part", path)
+        return {**info, "requested_downloads": [{"filepath": path}]}
+
+
+def wait_for(job, timeout=10):
+    end = time.time() + timeout
+    while job.active and time.time() < end: time.sleep(0.01)
+
+
+def test_cleanup_spares_running_jobs(tmp_path):
+    started, release = threading.Event(), threading.Event()
+    queue = DownloadQueue(lambda opts: StubExtractor(opts, started=started, release=release), str(tmp_path), max_jobs=2)
+
+    old = tmp_path / "old.mp4"
+    old.write_bytes(b"\0" * 2**20)
+    os.utime(old, (0, 0))
+    job = queue.submit("https://example.test/clip", "best")
+    assert started.wait(10)
+
+    # Over budget: everything that isn't the running job's goes, the .part file stays
+    removed = queue.cleanup(max_age_s=3600, max_bytes=2**20)
+    assert removed == 1 and not old.exists()
+    assert os.path.exists(os.path.join(job.dir, "clip.mp4.part"))
+
+    release.set()
+    wait_for(job)
+    assert job.status == "done", job.error
+    assert os.path.getsize(job.path) == 6 * 2**20
+    assert job.path.startswith(job.dir)
+
+    # Once finished it is fair game, and the emptied folder and job record go too
+    assert queue.cleanup(max_bytes=0) == 1
+    assert not os.path.exists(job.dir) and queue.get(job.id) is None
+
+
+def test_restarted_queue_gets_fresh_folders(tmp_path):
+    started, release = threading.Event(), threading.Event()
+    release.set()
+    dirs = []
+    for _ in range(2):  # a new queue stands in for a server restart
+        queue = DownloadQueue(lambda opts: StubExtractor(opts, size=16, started=started, release=release), str(tmp_path))
+        job = queue.submit("https://example.test/clip", "best")
+        wait_for(job)
+        assert job.status == "done", job.error
+        dirs.append(job.dir)
+    assert dirs[0] != dirs[1] and all(os.path.isdir(d) for d in dirs)
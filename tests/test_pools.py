@@ -0,0 +1,20 @@
+"""SharedPool recovers from a dead worker."""
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from tools.pools import SharedPool
+
+
+def test_broken_pool_is_replaced():
+    pool = SharedPool(2)
+    try:
+        assert list(pool.map(abs, [-1, -2, -3])) == [1, 2, 3]
+        with pytest.raises(BrokenProcessPool):
+            list(pool.map(os._exit, [1]))  # a worker dies, as if OOM-killed
+        # The next batch gets a fresh pool instead of the broken one
+        assert list(pool.map(pow, [2, 3], [3, 2])) == [8, 9]
+        assert pool.submit(abs, -4).result() == 4
+    finally:
+        pool.shutdown()
@@ -0,0 +1,67 @@
+"""WeatherClient against the bundled stub server (no network)."""
+import threading
+
+import pytest
+
+from tools.weather_client import (STUB_BAD_KEY, STUB_GARBLED, STUB_RATE_LIMITED, CityNotFound, StubServer,
+                                  WeatherClient, WeatherError)
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+def test_repeat_lookups_within_ttl_hit_the_cache(stub):
+    client = WeatherClient(base_url=stub.base_url, ttl=60)
+    first = client.current("Oslo")
+    assert client.current("  oslo ") == first
+    assert stub.requests == 1 and (client.hits, client.misses) == (1, 1)
+
+    expired = WeatherClient(base_url=stub.base_url, ttl=0)
+    expired.current("Oslo")
+    expired.current("Oslo")
+    assert stub.requests == 3
+
+
+def test_concurrent_lookups_share_one_request(stub):
+    client = WeatherClient(base_url=stub.base_url)
+    start, results = threading.Barrier(16), []
+
+    def look():
+        start.wait()
+        results.append(client.current("Lagos")["temp"])
+    threads = [threading.Thread(target=look) for _ in range(16)]
+    for t in threads: t.start()
+    for t in threads: t.join(10)
+    assert len(results) == 16 and len(set(results)) == 1
+    assert stub.requests == 1
+
+
+def test_cache_is_bounded(stub):
+    client = WeatherClient(base_url=stub.base_url, max_entries=2)
+    for city in ("Oslo", "Lima", "Oslo", "Pune"): client.current(city)
+    assert list(client._cache) == ["oslo", "pune"]
+
+
+def test_http_errors_map_to_weather_errors(stub):
+    client = WeatherClient(base_url=stub.base_url, retries=0)
+    with pytest.raises(CityNotFound):
+        client.current("Atlantis")
+    with pytest.raises(CityNotFound):  # cached, not asked again
+        client.current("atlantis")
+    assert stub.requests == 1
+
+    with pytest.raises(WeatherError, match="rate limit"):
+        client.current(STUB_RATE_LIMITED)
+    with pytest.raises(WeatherError, match="unexpected response"):
+        client.current(STUB_GARBLED)
+    with pytest.raises(WeatherError, match="key"):
+        WeatherClient(STUB_BAD_KEY, stub.base_url, retries=0).current("Oslo")
+
+    # Failures other than "not found" aren't cached
+    with pytest.raises(WeatherError, match="unexpected response"):
+        client.current(STUB_GARBLED)
+    assert stub.requests == 5
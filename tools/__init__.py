@@ -0,0 +1,35 @@
+"""Tool registry for Universal Studio Pro.
+
+Each tool lives in its own module under ``tools/`` and exposes a ``render()``
+function. Modules are imported only when the tool is first selected, so a
+session that never opens the Background Eraser never pays for rembg/onnxruntime.
+"""
+import importlib
+
+# Suite -> (caption, [tool names]) in sidebar order
+SUITES = {
+    "🎨 Media Studio": ("CREATIVE TOOLS", ["Photo Enhancer", "Background Eraser", "Meme Creator", "Video Downloader"]),
+    "❤️ Life Tracker": ("HEALTH & WEALTH", ["Weather", "Expenses", "BMI Calculator", "Health Journal"]),
+    "🛠️ Utility Toolkit": ("PRODUCTIVITY", ["QR Generator", "PDF Tools", "Resume Builder", "Quick Notes"]),
+}
+
+# Tool name -> module under tools/
+TOOLS = {
+    "Photo Enhancer": "photo_enhancer",
+    "Background Eraser": "background_eraser",
+    "Meme Creator": "meme_creator",
+    "Video Downloader": "video_downloader",
+    "Weather": "weather",
+    "Expenses": "expenses",
+    "BMI Calculator": "bmi_calculator",
+    "Health Journal": "health_journal",
+    "QR Generator": "qr_generator",
+    "PDF Tools": "pdf_tools",
+    "Resume Builder": "resume_builder",
+    "Quick Notes": "quick_notes",
+}
+
+
+def load_tool(name):
+    """Import (once per process) and return the module backing ``name``."""
+    return importlib.import_module(f"{__name__}.{TOOLS[name]}")
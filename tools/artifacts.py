@@ -0,0 +1,76 @@
+"""Generated files (batch ZIPs, PDFs, exports) kept until they are downloaded.
+
+Every tool writes its results under one ``ARTIFACTS_DIR``. ``new_path`` gives
+each result its own folder and deletes the session's previous result for the
+same tool, and ``prune`` removes whatever is past ``ARTIFACTS_MAX_AGE_HOURS``,
+then the oldest files until the folder fits ``ARTIFACTS_MAX_DIR_MB``, so
+results of sessions that went away don't pile up.
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import streamlit as st
+
+from tools.config import setting
+
+ARTIFACTS_DIR = setting("ARTIFACTS_DIR", os.path.join(tempfile.gettempdir(), "utility_apps_artifacts"))
+MAX_AGE_H = setting("ARTIFACTS_MAX_AGE_HOURS", 24, float)
+MAX_DIR_MB = setting("ARTIFACTS_MAX_DIR_MB", 2000, int)
+# Anything this recent may still be in the middle of being written
+IN_USE_S = 120
+
+
+def prune_dir(root, max_age_s=None, max_bytes=None, keep=(), min_age_s=0):
+    """Delete files under ``root`` older than ``max_age_s``, then the oldest until the rest fit ``max_bytes``.
+
+    Folders in ``keep`` are never entered and nothing modified in the last
+    ``min_age_s`` seconds is touched, empty folders included (one may have
+    just been made for a new file). Returns the number of files removed.
+    """
+    if not os.path.isdir(root): return 0
+    keep = {os.path.abspath(d) for d in keep}
+    files, dirs = [], []
+    for base, subdirs, names in os.walk(root):
+        # Prune kept folders so the walk never descends into them
+        subdirs[:] = [d for d in subdirs if os.path.abspath(os.path.join(base, d)) not in keep]
+        dirs.extend(os.path.join(base, d) for d in subdirs)
+        for name in names:
+            path = os.path.join(base, name)
+            try: st = os.stat(path)
+            except OSError: continue
+            files.append((st.st_mtime, st.st_size, path))
+    files.sort()
+    now, total, removed = time.time(), sum(f[1] for f in files), 0
+    for mtime, size, path in files:
+        if now - mtime < min_age_s: continue
+        expired = max_age_s is not None and now - mtime > max_age_s
+        oversize = max_bytes is not None and total > max_bytes
+        if not (expired or oversize): continue
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError: pass
+    for d in reversed(dirs):  # deepest first; only empty folders go
+        try:
+            if now - os.stat(d).st_mtime >= min_age_s: os.rmdir(d)
+        except OSError: pass
+    return removed
+
+
+def prune():
+    """Apply the age and size limits to ``ARTIFACTS_DIR``."""
+    return prune_dir(ARTIFACTS_DIR, MAX_AGE_H * 3600, MAX_DIR_MB * 1024 * 1024, min_age_s=IN_USE_S)
+
+
+def new_path(tool, name):
+    """Path for a new result file ``name``, replacing this session's previous result from ``tool``."""
+    prune()
+    key = f"artifact_{tool}"
+    previous = st.session_state.get(key)
+    if previous: shutil.rmtree(previous, ignore_errors=True)
+    os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+    folder = st.session_state[key] = tempfile.mkdtemp(prefix=f"{tool}_", dir=ARTIFACTS_DIR)
+    return os.path.join(folder, name)
@@ -0,0 +1,228 @@
+import streamlit as st
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from PIL import Image
+
+from tools import artifacts
+from tools.config import setting
+from tools.delivery import file_download
+from tools.export import encode, encoder_options, export_image_button, file_name, make_proxy
+
+try:
+    import onnxruntime as ort
+    from rembg import new_session, remove
+except ImportError:
+    remove = None
+
+MODELS = ["u2net", "u2netp", "isnet-general-use", "silueta", "bria-rmbg"]
+DEFAULT_MODEL = setting("REMBG_MODEL", "u2net")
+if DEFAULT_MODEL not in MODELS: MODELS.insert(0, DEFAULT_MODEL)
+# 0 lets onnxruntime pick (one thread per physical core)
+INTRA_OP_THREADS = setting("REMBG_INTRA_OP_THREADS", 0, int)
+INTER_OP_THREADS = setting("REMBG_INTER_OP_THREADS", 0, int)
+BATCH_WORKERS = setting("REMBG_BATCH_WORKERS", min(4, os.cpu_count() or 1), int)
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+_sessions = {}  # (model, intra_op, inter_op) -> session
+_build_locks = {}
+_build_locks_lock = threading.Lock()
+
+
+def _build_session(model, intra_op, inter_op):
+    opts = ort.SessionOptions()
+    opts.intra_op_num_threads = intra_op
+    opts.inter_op_num_threads = inter_op
+    return new_session(model, sess_opts=opts)
+
+
+def get_session(model=DEFAULT_MODEL, intra_op=INTRA_OP_THREADS, inter_op=INTER_OP_THREADS):
+    """Return the process-wide rembg session for ``model``, creating it once.
+
+    Sessions are plain per-process objects (not ``st.cache_resource``) so the
+    same helper works from the script thread, the warm-up thread and worker
+    processes. Loaded sessions are looked up without locking; building one
+    (which may download the model) only blocks callers of that same model.
+    """
+    key = (model, intra_op, inter_op)
+    session = _sessions.get(key)
+    if session is None:
+        with _build_locks_lock: lock = _build_locks.setdefault(key, threading.Lock())
+        with lock:
+            session = _sessions.get(key)  # another thread may have built it meanwhile
+            if session is None: session = _sessions[key] = _build_session(model, intra_op, inter_op)
+    return session
+
+
+def warm_up(model=DEFAULT_MODEL):
+    """Load the model and run one tiny inference so the first real request is fast."""
+    if remove is None: return
+    remove(Image.new("RGB", (64, 64)), session=get_session(model))
+
+
+# --- Batch mode: one session per worker process ---
+
+def _init_worker(model, intra_op):
+    # Build the session up front; if it fails, each task reports the error instead
+    # of the initializer breaking the whole pool
+    try: get_session(model, intra_op, 1)
+    except Exception: pass
+
+
+def _remove_one(name, data, model, intra_op, options):
+    """Worker task: return (name, encoded bytes or None, seconds, error)."""
+    t0 = time.perf_counter()
+    try:
+        out = remove(Image.open(BytesIO(data)), session=get_session(model, intra_op, 1))
+        return name, encode(out, options), time.perf_counter() - t0, None
+    except Exception as e:
+        return name, None, time.perf_counter() - t0, str(e)
+
+
+_pool_lock = threading.Lock()
+_pools = {}  # model -> (pool, intra_op); at most one entry
+
+
+def get_pool(model, workers=BATCH_WORKERS):
+    """Bounded worker pool kept across reruns so each worker's session stays warm.
+
+    Only the current model's pool is kept. Switching models shuts the old pool
+    down, so its workers (each holding model weights) exit once their queued
+    tasks finish instead of waiting for garbage collection.
+    """
+    with _pool_lock:
+        if model not in _pools:
+            for old, _ in _pools.values(): old.shutdown(wait=False)
+            _pools.clear()
+            # Split cores between workers instead of letting every worker grab them all
+            intra_op = INTRA_OP_THREADS or max(1, (os.cpu_count() or 1) // workers)
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=_init_worker, initargs=(model, intra_op))
+            _pools[model] = (pool, intra_op)
+        return _pools[model]
+
+
+def discard_pool(model, pool):
+    """Drop a broken pool (e.g. a worker was OOM-killed) so ``get_pool`` builds a fresh one."""
+    with _pool_lock:
+        if model in _pools and _pools[model][0] is pool: del _pools[model]
+    pool.shutdown(wait=False)
+
+
+def _zip_members(zf):
+    return [i for i in zf.infolist() if not i.is_dir() and i.filename.lower().endswith(IMAGE_EXTS)]
+
+
+def count_images(files):
+    total = 0
+    for f in files:
+        if f.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(f) as zf: total += len(_zip_members(zf))
+        else: total += 1
+    return total
+
+
+def iter_images(files):
+    """Yield (name, bytes) for uploaded images, lazily expanding any ZIP archives."""
+    for f in files:
+        if f.name.lower().endswith(".zip"):
+            f.seek(0)
+            with zipfile.ZipFile(f) as zf:
+                for info in _zip_members(zf):
+                    yield info.filename, zf.read(info)
+        else:
+            yield f.name, f.getvalue()
+
+
+def remove_batch(images, total, model, out_path, options=None, on_done=None):
+    """Process ``images`` on the worker pool, appending each result to the ZIP at ``out_path``.
+
+    At most two tasks per worker are in flight, and results are written as
+    soon as they finish, so memory stays bounded however large the batch.
+    Returns one timing row per image. If a worker dies (e.g. OOM-killed on a
+    huge image), the images in flight on that pool are reported as failed, the
+    pool is replaced, and the batch carries on. If another session switches
+    models mid-batch (shutting this pool down), the batch moves to a new pool;
+    tasks already queued on the old one still finish.
+    """
+    pool, intra_op = get_pool(model)
+    window = 2 * BATCH_WORKERS
+    images = iter(images)
+    pending, rows = {}, []
+    with zipfile.ZipFile(out_path, "w", zipfile.ZIP_STORED) as zf:  # outputs are already compressed
+        while True:
+            for name, data in images:
+                try: fut = pool.submit(_remove_one, name, data, model, intra_op, options)
+                except (BrokenProcessPool, RuntimeError):
+                    # Broken, or shut down because another session switched models
+                    discard_pool(model, pool)
+                    pool, intra_op = get_pool(model)
+                    fut = pool.submit(_remove_one, name, data, model, intra_op, options)
+                pending[fut] = name, pool
+                if len(pending) >= window: break
+            if not pending: break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name, ran_on = pending.pop(fut)
+                try: name, out, secs, err = fut.result()
+                except BrokenProcessPool:
+                    out, secs, err = None, 0.0, "Worker crashed (out of memory?)"
+                    discard_pool(model, ran_on)
+                    if ran_on is pool: pool, intra_op = get_pool(model)
+                if out is not None:
+                    zf.writestr(file_name(os.path.splitext(name)[0], options or {"format": "PNG"}), out)
+                rows.append({"Image": name, "Seconds": round(secs, 3), "Status": err or "OK"})
+                if on_done: on_done(len(rows), total, name)
+    return rows
+
+
+def render_batch(model):
+    files = st.file_uploader("Upload Images or ZIP", type=["jpg", "png", "jpeg", "zip"], accept_multiple_files=True)
+    with st.expander("Export options"): options = encoder_options("nobg_batch")
+    if files and st.button("✨ Remove All Backgrounds"):
+        total = count_images(files)
+        if not total:
+            st.warning("No images found.")
+            return
+        bar = st.progress(0.0, text=f"0 / {total}")
+        out_path = artifacts.new_path("nobg", "nobg.zip")
+        t0 = time.perf_counter()
+        rows = remove_batch(iter_images(files), total, model, out_path, options,
+                            lambda i, n, name: bar.progress(i / n, text=f"{i} / {n} · {name}"))
+        ok = sum(r["Status"] == "OK" for r in rows)
+        st.success(f"Processed {ok}/{len(rows)} images in {time.perf_counter() - t0:.1f}s")
+        st.dataframe(rows, use_container_width=True)
+        file_download("⬇️ Download ZIP", out_path)
+
+
+def render():
+    st.markdown("<h1 class='main-title'>AI Background Eraser</h1>", unsafe_allow_html=True)
+    
+    if remove is None:
+        st.error("⚠️ `rembg` library missing.")
+    else:
+        model = st.selectbox("Model", MODELS, index=MODELS.index(DEFAULT_MODEL))
+        if st.radio("Mode", ["Single", "Batch"], horizontal=True) == "Batch":
+            render_batch(model)
+            return
+        upl = st.file_uploader("Upload Image", type=["jpg", "png"])
+        if upl:
+            img = Image.open(upl)
+            proxy = make_proxy(img)
+            sig = (upl.file_id, model)
+            c1, c2 = st.columns(2)
+            with c1: st.image(proxy, caption="Original", use_column_width=True)
+            with c2:
+                # Preview runs on the proxy; the full-size pass only runs for the download
+                if st.button("✨ Remove Background"):
+                    with st.spinner("Processing..."):
+                        st.session_state.nobg_preview = (sig, remove(proxy, session=get_session(model)))
+                preview = st.session_state.get("nobg_preview")
+                if preview and preview[0] == sig:
+                    st.image(preview[1], caption="No Background", use_column_width=True)
+                    export_image_button("Download Image", "nobg", sig, lambda: remove(img, session=get_session(model)), "nobg")
@@ -0,0 +1,14 @@
+import streamlit as st
+
+
+def render():
+    st.markdown("<h1 class='main-title'>BMI Calculator</h1>", unsafe_allow_html=True)
+    c1, c2 = st.columns(2)
+    with c1: w = st.number_input("Weight (kg)", 60.0)
+    with c2: h = st.number_input("Height (m)", 1.70)
+    
+    if st.button("Calculate"):
+        bmi = w / (h ** 2)
+        state = "Normal" if 18.5 <= bmi < 25 else "Overweight" if bmi >= 25 else "Underweight"
+        color = "#2ecc71" if state == "Normal" else "#e67e22"
+        st.markdown(f"<div style='background:{color}20; border-left:5px solid {color}; padding:20px; border-radius:10px;'><h3>BMI: {bmi:.2f}</h3><p style='margin:0; font-weight:bold; color:{color}'>{state}</p></div>", unsafe_allow_html=True)
@@ -0,0 +1,18 @@
+"""Runtime settings shared by the tools.
+
+Values come from environment variables first, then ``.streamlit/secrets.toml``,
+so deployments can configure the app without editing code.
+"""
+import os
+import streamlit as st
+
+
+def setting(key, default=None, cast=str):
+    """Return setting ``key`` converted with ``cast``, or ``default`` if unset."""
+    value = os.environ.get(key)
+    if value is None:
+        try: value = st.secrets.get(key)
+        except Exception: value = None
+    if value is None or value == "": return default
+    if cast is bool and isinstance(value, str): return value.strip().lower() in ("1", "true", "yes", "on")
+    return cast(value)
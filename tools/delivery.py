@@ -0,0 +1,157 @@
+"""Serve large files from disk without copying them into the Python heap.
+
+``st.download_button`` needs the whole payload as bytes, so every download of
+a multi-GB video or ZIP is materialized in memory. When ``DELIVERY_PORT`` is
+set, a small file server runs alongside Streamlit instead: files are
+published under an unguessable token and streamed with ``sendfile`` (zero
+copy), with ``Content-Length``, ``Accept-Ranges`` and single ``Range``
+requests so browsers can resume and media players can seek.
+
+Without it, ``file_download`` falls back to a download button whose data is
+only read when clicked.
+"""
+import mimetypes
+import os
+import re
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote
+
+import streamlit as st
+
+from tools.config import setting
+
+DELIVERY_PORT = setting("DELIVERY_PORT", None, int)
+DELIVERY_HOST = setting("DELIVERY_HOST", "0.0.0.0")
+# Public base URL of the file server, e.g. https://files.example.com. Defaults to
+# the host the browser used to reach the app, on DELIVERY_PORT.
+DELIVERY_BASE_URL = setting("DELIVERY_BASE_URL", None)
+LINK_TTL_S = setting("DELIVERY_LINK_TTL_S", 3600, int)
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+class FileRegistry:
+    """Token -> (path, download name, expiry)."""
+
+    def __init__(self):
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def publish(self, path, name=None, ttl=LINK_TTL_S):
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            now = time.time()
+            for t in [t for t, (_, _, exp) in self._files.items() if exp < now]: del self._files[t]
+            self._files[token] = (os.path.abspath(path), name or os.path.basename(path), now + ttl)
+        return token
+
+    def lookup(self, token):
+        with self._lock: entry = self._files.get(token)
+        if entry and entry[2] >= time.time() and os.path.isfile(entry[0]): return entry[:2]
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = None  # set by FileServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args): pass
+
+    def do_HEAD(self): self._serve(body=False)
+
+    def do_GET(self): self._serve(body=True)
+
+    def _serve(self, body):
+        entry = self.registry.lookup(self.path.strip("/").split("/")[0])
+        if entry is None:
+            self.send_error(404)
+            return
+        path, name = entry
+        size = os.path.getsize(path)
+        start, end, status = 0, size - 1, 200
+        m = _RANGE.match(self.headers.get("Range", ""))
+        if m and (m.group(1) or m.group(2)):
+            if m.group(1):
+                start = int(m.group(1))
+                if m.group(2): end = min(int(m.group(2)), size - 1)
+            else:  # suffix range: last N bytes
+                start = max(0, size - int(m.group(2)))
+            if start > end or start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            status = 206
+        length = end - start + 1
+        self.send_response(status)
+        self.send_header("Content-Type", mimetypes.guess_type(name)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(name)}")
+        if status == 206: self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if body and length:
+            with open(path, "rb") as fl:
+                try: self.connection.sendfile(fl, start, length)
+                except (BrokenPipeError, ConnectionResetError): pass
+
+
+class FileServer:
+    """Threaded HTTP server for published files, running on a daemon thread."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.registry = FileRegistry()
+        handler = type("Handler", (_Handler,), {"registry": self.registry})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True, name="delivery").start()
+
+    def url(self, path, name=None, base_url=None):
+        token = self.registry.publish(path, name)
+        name = name or os.path.basename(path)
+        return f"{(base_url or f'http://127.0.0.1:{self.port}').rstrip('/')}/{token}/{quote(name)}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@st.cache_resource
+def get_server():
+    """The process-wide file server, or None when DELIVERY_PORT isn't configured."""
+    if DELIVERY_PORT is None: return None
+    return FileServer(DELIVERY_HOST, DELIVERY_PORT)
+
+
+def _base_url():
+    if DELIVERY_BASE_URL: return DELIVERY_BASE_URL
+    try: host = st.context.headers.get("Host", "localhost")
+    except Exception: host = "localhost"
+    return f"http://{host.rsplit(':', 1)[0]}:{DELIVERY_PORT}"
+
+
+def _reader(path):
+    def read():
+        with open(path, "rb") as fl: return fl.read()
+    return read
+
+
+def file_download(label, path, name=None, key=None):
+    """Download control for a file on disk, streamed by the file server when available."""
+    name = name or os.path.basename(path)
+    server = get_server()
+    if server is None:
+        # Fallback: deferred read, so the bytes are loaded only on click
+        st.download_button(label, _reader(path), name, key=key)
+        return
+    # Links are cached per session so reruns don't mint a new token every time
+    links = st.session_state.setdefault("delivery_links", {})
+    cache_key = (os.path.abspath(path), name, os.path.getmtime(path))
+    if cache_key not in links or links[cache_key][1] < time.time():
+        links[cache_key] = (server.url(path, name, _base_url()), time.time() + LINK_TTL_S - 60)
+    st.link_button(label, links[cache_key][0])
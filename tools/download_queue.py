@@ -0,0 +1,116 @@
+"""Background download queue for the Video Downloader.
+
+Jobs run on a bounded thread pool outside the Streamlit script thread, so a
+long download never blocks the page and keeps going across reruns. yt-dlp
+progress hooks update each job, and the UI polls the jobs it owns. Each job
+writes into its own ``<out_dir>/<job id>/`` folder, which ``cleanup`` leaves
+alone while the job is active. Job ids are random, so a restarted server never
+reuses the folder of a download left over from an earlier process.
+
+The extractor is injectable: anything that behaves like ``yt_dlp.YoutubeDL``
+(a context manager taking an options dict, with ``extract_info`` and
+``prepare_filename``, calling ``options["progress_hooks"]``) can be passed as
+``extractor``, which lets the queue run against a local stub.
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.artifacts import prune_dir
+
+
+class Job:
+    """One download and its live progress. Fields are written by the worker thread."""
+
+    def __init__(self, job_id, url, fmt):
+        self.id = job_id
+        self.url = url
+        self.fmt = fmt
+        self.status = "queued"  # queued -> running -> done | error
+        self.downloaded = 0
+        self.total = None
+        self.speed = None
+        self.dir = None
+        self.path = None
+        self.error = None
+        self.created = time.time()
+
+    @property
+    def progress(self):
+        if self.status == "done": return 1.0
+        return min(1.0, self.downloaded / self.total) if self.total else 0.0
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+
+class DownloadQueue:
+    def __init__(self, extractor, out_dir="downloads", max_jobs=2, fragments=4):
+        self.extractor = extractor
+        self.out_dir = out_dir
+        self.fragments = fragments
+        self.jobs = {}
+        self._lock = threading.Lock()
+        # The pool size is the cap on concurrent downloads; extra jobs wait queued
+        self._pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="download")
+
+    def submit(self, url, fmt):
+        """Queue ``url`` with yt-dlp format string ``fmt`` and return the new Job."""
+        with self._lock:
+            job = Job(uuid.uuid4().hex, url, fmt)
+            job.dir = os.path.join(self.out_dir, str(job.id))
+            self.jobs[job.id] = job
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def _hook(self, job):
+        def hook(d):
+            job.downloaded = d.get("downloaded_bytes") or job.downloaded
+            job.total = d.get("total_bytes") or d.get("total_bytes_estimate") or job.total
+            job.speed = d.get("speed")
+        return hook
+
+    def _run(self, job):
+        job.status = "running"
+        opts = {
+            "outtmpl": os.path.join(job.dir, "%(title)s.%(ext)s"),
+            "format": job.fmt,
+            "progress_hooks": [self._hook(job)],
+            "concurrent_fragment_downloads": self.fragments,
+            "quiet": True,
+            "noprogress": True,
+        }
+        try:
+            with self.extractor(opts) as ydl:
+                info = ydl.extract_info(job.url, download=True)
+                # After a merge the final file can differ from the template name
+                done = info.get("requested_downloads") or [{}]
+                job.path = done[0].get("filepath") or ydl.prepare_filename(info)
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "error"
+
+    def cleanup(self, max_age_s=None, max_bytes=None):
+        """Delete old downloads, then the oldest ones until the folder fits ``max_bytes``.
+
+        Folders of queued or running jobs (including their partial files) are
+        never touched. Returns the number of files removed.
+        """
+        if not os.path.isdir(self.out_dir): return 0
+        # Holding the lock keeps new jobs from starting mid-sweep
+        with self._lock:
+            busy = [j.dir for j in self.jobs.values() if j.active]
+            removed, now = prune_dir(self.out_dir, max_age_s, max_bytes, keep=busy), time.time()
+            # Forget finished jobs whose file is gone, and failures past the age limit
+            stale = [j.id for j in self.jobs.values()
+                     if (j.status == "done" and not os.path.exists(j.path))
+                     or (j.status == "error" and max_age_s is not None and now - j.created > max_age_s)]
+            for jid in stale: del self.jobs[jid]
+        return removed
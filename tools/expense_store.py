@@ -0,0 +1,174 @@
+"""SQLite-backed ledger for the Expense Manager.
+
+Rows live in a shared ``SQLiteStore`` database, so inserts are O(log n) index
+updates instead of a full DataFrame copy, and they persist across sessions.
+
+Per-category and per-month rollups are updated in the same transaction as
+every insert, so charts read a few dozen pre-aggregated rows however long
+the ledger gets, and the table reads one LIMITed page at a time.
+"""
+import csv
+from collections import defaultdict
+
+import pandas as pd
+
+from tools.sqlite_store import SQLiteStore
+
+COLUMNS = ["Date", "Item", "Category", "Amount"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,          -- ISO yyyy-mm-dd, so text order is date order
+    item TEXT NOT NULL DEFAULT '',
+    category TEXT NOT NULL,
+    amount REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date);
+CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category, date);
+CREATE TABLE IF NOT EXISTS rollup_category (
+    category TEXT PRIMARY KEY,
+    total REAL NOT NULL,
+    n INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollup_month (
+    month TEXT NOT NULL,         -- yyyy-mm
+    category TEXT NOT NULL,
+    total REAL NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (month, category)
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_UPSERT_CATEGORY = """INSERT INTO rollup_category(category, total, n) VALUES (?, ?, ?)
+    ON CONFLICT(category) DO UPDATE SET total = total + excluded.total, n = n + excluded.n"""
+_UPSERT_MONTH = """INSERT INTO rollup_month(month, category, total, n) VALUES (?, ?, ?, ?)
+    ON CONFLICT(month, category) DO UPDATE SET total = total + excluded.total, n = n + excluded.n"""
+
+
+def _clean_chunk(chunk, first_line):
+    """Validate and normalize one CSV chunk to COLUMNS; ``first_line`` is the file line of its first row."""
+    chunk.columns = [c.strip().title() for c in chunk.columns]
+    missing = {"Date", "Category", "Amount"} - set(chunk.columns)
+    if missing: raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+    if "Item" not in chunk: chunk["Item"] = ""
+
+    def reject(bad, problem):
+        if bad.any():
+            lines = [str(first_line + k) for k in bad.to_numpy().nonzero()[0][:5]]
+            raise ValueError(f"{problem} on line(s) {', '.join(lines)}{' ...' if bad.sum() > 5 else ''}.")
+
+    dates = pd.to_datetime(chunk["Date"], errors="coerce")
+    reject(dates.isna(), "Missing or unreadable Date")
+    category = chunk["Category"].astype("string").str.strip()
+    reject(category.isna() | (category == ""), "Missing Category")
+    amount = pd.to_numeric(chunk["Amount"], errors="coerce")
+    reject(amount.isna() | amount.abs().eq(float("inf")), "Missing or unreadable Amount")
+    chunk["Date"] = dates.dt.strftime("%Y-%m-%d")
+    chunk["Category"] = category.astype(str)
+    chunk["Item"] = chunk["Item"].fillna("").astype(str)
+    chunk["Amount"] = amount.astype(float)
+    return chunk[COLUMNS]
+
+
+class ExpenseStore(SQLiteStore):
+    def __init__(self, path):
+        super().__init__(path, _SCHEMA)
+        # Databases from before the rollups existed: build them once
+        if self.conn.execute("SELECT NOT EXISTS(SELECT 1 FROM rollup_category) AND EXISTS(SELECT 1 FROM expenses)").fetchone()[0]:
+            self.rebuild_rollups()
+
+    # --- Writes ---
+
+    def add(self, date, item, category, amount):
+        self.add_many([(str(date), item, category, float(amount))])
+
+    def add_many(self, rows):
+        """Insert (date, item, category, amount) tuples and fold them into the rollups, in one transaction."""
+        with self.conn: self._insert(rows)
+
+    def _insert(self, rows):
+        # No commit: callers own the transaction
+        rows = list(rows)
+        by_cat, by_month = defaultdict(lambda: [0.0, 0]), defaultdict(lambda: [0.0, 0])
+        for date, _, category, amount in rows:
+            for agg in (by_cat[category], by_month[(date[:7], category)]):
+                agg[0] += amount
+                agg[1] += 1
+        self.conn.executemany("INSERT INTO expenses(date, item, category, amount) VALUES (?, ?, ?, ?)", rows)
+        self.conn.executemany(_UPSERT_CATEGORY, [(c, t, n) for c, (t, n) in by_cat.items()])
+        self.conn.executemany(_UPSERT_MONTH, [(m, c, t, n) for (m, c), (t, n) in by_month.items()])
+
+    def rebuild_rollups(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM rollup_category")
+            self.conn.execute("DELETE FROM rollup_month")
+            self.conn.execute("INSERT INTO rollup_category SELECT category, SUM(amount), COUNT(*) FROM expenses GROUP BY category")
+            self.conn.execute("INSERT INTO rollup_month SELECT substr(date, 1, 7), category, SUM(amount), COUNT(*) "
+                              "FROM expenses GROUP BY substr(date, 1, 7), category")
+
+    def import_csv(self, fileobj, chunksize=20_000):
+        """Stream a CSV with Date/Item/Category/Amount columns in chunks; yields rows read so far.
+
+        The whole file is imported in one transaction: a bad row anywhere
+        raises ``ValueError`` (naming the line) and nothing is kept, so a
+        retry can't duplicate rows. Other writers wait until the import ends.
+        """
+        done = 0
+        try:
+            for chunk in pd.read_csv(fileobj, chunksize=chunksize):
+                self._insert(_clean_chunk(chunk, first_line=done + 2).itertuples(index=False, name=None))
+                done += len(chunk)
+                yield done
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+    def clear(self):
+        with self.conn:
+            for table in ("expenses", "rollup_category", "rollup_month"): self.conn.execute(f"DELETE FROM {table}")
+
+    def get_budget(self, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'monthly_budget'").fetchone()
+        return float(row[0]) if row else default
+
+    def set_budget(self, amount):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('monthly_budget', ?)", (str(float(amount)),))
+
+    # --- Reads ---
+
+    def count(self):
+        # From the rollup: COUNT(*) on the ledger would scan every row
+        return self.conn.execute("SELECT COALESCE(SUM(n), 0) FROM rollup_category").fetchone()[0]
+
+    def totals_by_category(self):
+        return pd.read_sql_query(
+            "SELECT category AS Category, total AS Amount FROM rollup_category ORDER BY total DESC", self.conn)
+
+    def monthly(self):
+        """Month x category totals from the rollup, plus the running total across months."""
+        df = pd.read_sql_query(
+            "SELECT month AS Month, category AS Category, total AS Amount FROM rollup_month ORDER BY month", self.conn)
+        per_month = df.groupby("Month", as_index=False)["Amount"].sum()
+        per_month["Running Total"] = per_month["Amount"].cumsum()
+        return df, per_month
+
+    def recent(self, limit=100, offset=0):
+        return pd.read_sql_query(
+            "SELECT date AS Date, item AS Item, category AS Category, amount AS Amount FROM expenses "
+            "ORDER BY date DESC, id DESC LIMIT ? OFFSET ?", self.conn, params=(limit, offset))
+
+    def export_csv(self, out_path):
+        """Write the ledger to ``out_path`` straight from the cursor, without building a frame."""
+        cur = self.conn.execute("SELECT date, item, category, amount FROM expenses ORDER BY date, id")
+        with open(out_path, "w", newline="", encoding="utf-8") as fl:
+            w = csv.writer(fl)
+            w.writerow(COLUMNS)
+            while True:
+                rows = cur.fetchmany(10_000)
+                if not rows: break
+                w.writerows(rows)
+        return out_path
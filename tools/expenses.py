@@ -0,0 +1,95 @@
+import streamlit as st
+import os
+
+from tools import artifacts
+from tools.config import setting
+from tools.delivery import file_download
+from tools.expense_store import ExpenseStore
+
+try:
+    import plotly.express as px
+    import plotly.graph_objects as go
+except ImportError:
+    px = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXPENSES_DB = setting("EXPENSES_DB", os.path.join(ROOT, "data", "expenses.db"))
+DEFAULT_BUDGET = setting("EXPENSES_MONTHLY_BUDGET", 2000.0, float)
+PAGE_SIZE = 50
+
+
+@st.cache_resource
+def get_store():
+    return ExpenseStore(EXPENSES_DB)
+
+
+def render_charts(store):
+    tab1, tab2, tab3 = st.tabs(["By Category", "Over Time", "Budget"])
+    with tab1:
+        fig = px.pie(store.totals_by_category(), values='Amount', names='Category', hole=0.4, color_discrete_sequence=px.colors.sequential.RdBu)
+        st.plotly_chart(fig, use_container_width=True)
+    by_cat, per_month = store.monthly()
+    with tab2:
+        fig = px.bar(by_cat, x="Month", y="Amount", color="Category", color_discrete_sequence=px.colors.sequential.RdBu)
+        fig.add_trace(go.Scatter(x=per_month["Month"], y=per_month["Running Total"], name="Running Total", yaxis="y2", line=dict(color="#2c3e50")))
+        fig.update_layout(yaxis2=dict(overlaying="y", side="right", showgrid=False), legend=dict(orientation="h"))
+        st.plotly_chart(fig, use_container_width=True)
+    with tab3:
+        budget = st.number_input("Monthly Budget", 0.0, value=store.get_budget(DEFAULT_BUDGET), step=100.0)
+        if budget != store.get_budget(DEFAULT_BUDGET): store.set_budget(budget)
+        recent = per_month.tail(12)
+        colors = ["#e74c3c" if a > budget else "#2ecc71" for a in recent["Amount"]]
+        fig = go.Figure(go.Bar(x=recent["Month"], y=recent["Amount"], marker_color=colors, name="Spent"))
+        fig.add_hline(y=budget, line_dash="dash", annotation_text="Budget")
+        st.plotly_chart(fig, use_container_width=True)
+        if len(recent):
+            last = recent.iloc[-1]
+            st.metric(f"Spent in {last['Month']}", f"{last['Amount']:,.2f}", f"{budget - last['Amount']:,.2f} left", delta_color="normal")
+
+
+def render_table(store, total_rows):
+    pages = (total_rows + PAGE_SIZE - 1) // PAGE_SIZE
+    c1, c2 = st.columns([1, 3])
+    with c1: page = st.number_input(f"Page (of {pages:,})", 1, pages, 1)
+    with c2: st.caption(f"{total_rows:,} expenses, newest first")
+    # Only one page is ever queried and rendered
+    st.dataframe(store.recent(PAGE_SIZE, (page - 1) * PAGE_SIZE), use_container_width=True, hide_index=True)
+
+
+def render():
+    st.markdown("<h1 class='main-title'>Expense Manager</h1>", unsafe_allow_html=True)
+    st.caption("Expenses are saved on the server and shared by everyone using this app.")
+    store = get_store()
+        
+    with st.form("exp_form", clear_on_submit=True):
+        c1, c2 = st.columns(2)
+        with c1: 
+            item = st.text_input("Item")
+            amt = st.number_input("Amount", 0.0)
+        with c2:
+            cat = st.selectbox("Category", ["Food", "Travel", "Bills", "Health"])
+            dt = st.date_input("Date")
+        if st.form_submit_button("Add Expense"):
+            store.add(dt, item, cat, amt)
+            st.success("Saved!")
+
+    with st.expander("Import / Export CSV"):
+        up = st.file_uploader("CSV with Date, Item, Category, Amount columns", type="csv")
+        if up and st.button("Import"):
+            bar = st.progress(0.0, text="Importing...")
+            n = 0
+            try:
+                for n in store.import_csv(up):
+                    bar.progress(min(1.0, up.tell() / max(1, up.size)), text=f"{n:,} rows read")
+                st.success(f"Imported {n:,} rows.")
+            except ValueError as e: st.error(str(e))
+        if st.button("Export"):
+            out = store.export_csv(artifacts.new_path("expenses", "expenses.csv"))
+            st.session_state.expenses_export = out
+        if st.session_state.get("expenses_export") and os.path.isfile(st.session_state.expenses_export):
+            file_download("⬇️ Download CSV", st.session_state.expenses_export)
+
+    total_rows = store.count()
+    if total_rows and px:
+        render_charts(store)
+        render_table(store, total_rows)
@@ -0,0 +1,175 @@
+"""Encoders, preview proxies and on-demand export, shared by the image tools.
+
+Interactive reruns work on a downscaled proxy of the upload. The full-size
+render and encode only run when the user asks for a download, optionally on
+a background thread so the page stays responsive. Downloads can be PNG, WebP
+or JPEG at a chosen quality/compression level.
+"""
+import streamlit as st
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from PIL import Image
+
+from tools.config import setting
+
+PREVIEW_MAX_PX = setting("PREVIEW_MAX_PX", 1200, int)
+EXPORT_IN_BACKGROUND = setting("EXPORT_IN_BACKGROUND", True, bool)
+
+_executor = ThreadPoolExecutor(max_workers=setting("EXPORT_WORKERS", 2, int), thread_name_prefix="export")
+
+
+# --- Encoders ---
+
+FORMATS = {
+    # name: (PIL format, extension, mime)
+    "PNG": ("PNG", "png", "image/png"),
+    "WebP": ("WEBP", "webp", "image/webp"),
+    "JPEG": ("JPEG", "jpg", "image/jpeg"),
+}
+DEFAULT_OPTIONS = {"format": "PNG", "quality": 85, "level": 6, "lossless": False}
+# Presets for the size/latency comparison table
+COMPARE_PRESETS = [
+    ("PNG (fast)", {"format": "PNG", "level": 1}),
+    ("PNG (default)", {"format": "PNG", "level": 6}),
+    ("PNG (optimized)", {"format": "PNG", "level": 9}),
+    ("WebP q80", {"format": "WebP", "quality": 80}),
+    ("WebP lossless", {"format": "WebP", "lossless": True}),
+    ("JPEG q85", {"format": "JPEG", "quality": 85}),
+]
+
+_buffers = threading.local()
+
+
+def encode(img, options=None):
+    """Encode ``img`` with ``options`` (see DEFAULT_OPTIONS) and return the bytes.
+
+    Each thread reuses one BytesIO, so repeated exports don't keep growing
+    fresh buffers from scratch.
+    """
+    opts = {**DEFAULT_OPTIONS, **(options or {})}
+    fmt = FORMATS[opts["format"]][0]
+    buf = getattr(_buffers, "buf", None)
+    if buf is None: buf = _buffers.buf = BytesIO()
+    buf.seek(0)
+    buf.truncate()
+    if fmt == "PNG":
+        # optimize=True is libpng's slowest path, so only use it at the top level
+        img.save(buf, format=fmt, compress_level=opts["level"], optimize=opts["level"] >= 9)
+    elif fmt == "WEBP":
+        img.save(buf, format=fmt, quality=opts["quality"], lossless=opts["lossless"], method=4)
+    else:
+        if img.mode in ("RGBA", "LA", "P"):
+            # JPEG has no alpha channel: flatten onto white
+            img = img.convert("RGBA")
+            flat = Image.new("RGB", img.size, "white")
+            flat.paste(img, mask=img.getchannel("A"))
+            img = flat
+        elif img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.save(buf, format=fmt, quality=opts["quality"], optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def file_name(stem, options):
+    return f"{stem}.{FORMATS[options['format']][1]}"
+
+
+def mime_type(options):
+    return FORMATS[options["format"]][2]
+
+
+def compare_encoders(img):
+    """Encode ``img`` with every preset; return rows of size and encode time."""
+    rows = []
+    for label, opts in COMPARE_PRESETS:
+        t0 = time.perf_counter()
+        size = len(encode(img, opts))
+        rows.append({"Option": label, "Size (KB)": round(size / 1024, 1), "Encode (ms)": round((time.perf_counter() - t0) * 1000, 1)})
+    return rows
+
+
+def encoder_options(key, default_format="PNG"):
+    """Format/quality widgets; returns an options dict for ``encode``."""
+    names = list(FORMATS)
+    c1, c2 = st.columns(2)
+    with c1: fmt = st.selectbox("Format", names, index=names.index(default_format), key=f"{key}_fmt")
+    opts = {"format": fmt}
+    with c2:
+        if fmt == "PNG":
+            opts["level"] = st.slider("Compression level", 0, 9, DEFAULT_OPTIONS["level"], key=f"{key}_level",
+                                      help="Higher is smaller but slower; 9 also runs the optimizer.")
+        elif fmt == "WebP":
+            opts["lossless"] = st.checkbox("Lossless", key=f"{key}_lossless")
+            if not opts["lossless"]: opts["quality"] = st.slider("Quality", 10, 100, 80, key=f"{key}_quality")
+        else:
+            opts["quality"] = st.slider("Quality", 10, 100, DEFAULT_OPTIONS["quality"], key=f"{key}_quality")
+    return {**DEFAULT_OPTIONS, **opts}
+
+
+def export_image_button(label, key, signature, render_full, stem):
+    """Encoder options, a size/latency report, and an on-demand download of ``render_full() -> Image``."""
+    with st.expander("Export options"):
+        opts = encoder_options(key)
+        if st.button("📊 Compare formats", key=f"{key}_compare"):
+            with st.spinner("Encoding..."):
+                st.dataframe(compare_encoders(render_full()), use_container_width=True, hide_index=True)
+    export_button(label, key, (signature, tuple(sorted(opts.items()))), lambda: encode(render_full(), opts),
+                  file_name(stem, opts), mime_type(opts))
+
+
+# --- Preview proxies ---
+
+def proxy_scale(img, max_px=PREVIEW_MAX_PX):
+    """Factor (<= 1) that fits ``img``'s long side into ``max_px``."""
+    return min(1.0, max_px / max(img.size))
+
+
+def make_proxy(img, max_px=PREVIEW_MAX_PX):
+    """Downscaled copy of ``img`` for previews; returns ``img`` itself if already small."""
+    scale = proxy_scale(img, max_px)
+    if scale >= 1.0: return img
+    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    # reducing_gap does a fast integer reduce first, then a proper resample
+    return img.resize(size, Image.LANCZOS, reducing_gap=2.0)
+
+
+def export_button(label, key, signature, render_full, file_name, mime):
+    """Two-step download: "Prepare" renders ``render_full() -> bytes``, then the real download button.
+
+    ``signature`` identifies the current inputs; when it changes the prepared
+    export is discarded so a stale file is never offered.
+    """
+    state = st.session_state.setdefault(f"export_{key}", {})
+    if state.get("sig") != signature:
+        state.clear()
+        state["sig"] = signature
+
+    if "job" not in state:
+        if not st.button(f"⚙️ Prepare {label}", key=f"{key}_prepare"): return
+        if EXPORT_IN_BACKGROUND:
+            state["job"] = _executor.submit(render_full)
+        else:
+            state["job"] = Future()
+            with st.spinner("Rendering full resolution..."):
+                state["job"].set_result(render_full())
+
+    job = state["job"]
+    if job.done(): _offer(job, label, file_name, mime, key)
+    else: _wait_for(job)
+
+
+def _offer(job, label, file_name, mime, key):
+    try: data = job.result()
+    except Exception as e:
+        st.error(f"Export failed: {e}")
+        return
+    st.download_button(f"⬇️ {label}", data, file_name, mime, key=f"{key}_download")
+
+
+@st.fragment(run_every=0.5)
+def _wait_for(job):
+    # Polls without rerunning the whole page; one full rerun once the file is ready
+    if job.done(): st.rerun()
+    st.caption("⏳ Rendering full resolution...")
@@ -0,0 +1,16 @@
+import streamlit as st
+import datetime
+
+
+def render():
+    st.markdown("<h1 class='main-title'>Health Journal</h1>", unsafe_allow_html=True)
+    date = st.date_input("Last Period")
+    cycle = st.slider("Cycle Length", 21, 35, 28)
+    nxt = date + datetime.timedelta(days=cycle)
+    
+    st.markdown(f"""
+    <div style="background:#e3f2fd; padding:20px; border-radius:12px; border:1px solid #bbdefb; text-align:center;">
+        <h3 style="color:#1565c0; margin:0;">Next Predicted Period</h3>
+        <h2 style="color:#0d47a1; margin:10px 0;">{nxt.strftime('%B %d, %Y')}</h2>
+    </div>
+    """, unsafe_allow_html=True)
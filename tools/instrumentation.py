@@ -0,0 +1,254 @@
+"""Opt-in per-tool instrumentation (``INSTRUMENT=1``).
+
+Each rerun of a tool is timed, and with ``INSTRUMENT_MEMORY`` (on by default
+when instrumenting) tracemalloc records the peak and net allocation of that
+rerun. Hits and misses of every ``functools.lru_cache`` in ``tools.*``, every
+Streamlit cache wrapped with ``counted``, and any object registered with
+``watch`` that exposes ``hits``/``misses`` are diffed around the rerun and
+attributed to the tool.
+
+Stats are process-wide, so they cover every browser session. Both probes are
+global too: when sessions overlap, a rerun's memory peak includes the other
+sessions' allocations, and its cache hits and misses include theirs (so a tool
+can be credited with another tool's cache activity). The admin panel appears in the sidebar at ``?admin=1`` (or
+``?admin=<ADMIN_TOKEN>`` when a token is set) and exports JSON or
+Prometheus text, shows top allocations, and can profile one rerun.
+"""
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import streamlit as st
+
+from tools.config import setting
+
+ENABLED = setting("INSTRUMENT", False, bool)
+TRACE_MEMORY = ENABLED and setting("INSTRUMENT_MEMORY", True, bool)
+ADMIN_TOKEN = setting("ADMIN_TOKEN")
+WINDOW = 500  # recent reruns kept per tool for percentiles
+PREFIX = "utility_apps"
+
+_lock = threading.Lock()
+_stats = {}
+_watched = {}
+if TRACE_MEMORY and not tracemalloc.is_tracing(): tracemalloc.start()
+
+
+class ToolStats:
+    def __init__(self):
+        self.runs = self.errors = 0
+        self.seconds = 0.0
+        self.recent = deque(maxlen=WINDOW)
+        self.peak_bytes = self.last_peak_bytes = self.last_net_bytes = 0
+        self.hits = self.misses = 0
+
+    def quantile(self, q):
+        if not self.recent: return 0.0
+        data = sorted(self.recent)
+        return data[min(len(data) - 1, int(q * len(data)))]
+
+    def as_dict(self):
+        return {"runs": self.runs, "errors": self.errors, "seconds_total": round(self.seconds, 6),
+                "p50_s": round(self.quantile(0.5), 6), "p95_s": round(self.quantile(0.95), 6),
+                "max_s": round(max(self.recent, default=0.0), 6),
+                "peak_bytes": self.peak_bytes, "last_peak_bytes": self.last_peak_bytes,
+                "last_net_bytes": self.last_net_bytes, "cache_hits": self.hits, "cache_misses": self.misses}
+
+
+def watch(name, obj):
+    """Include ``obj.hits`` / ``obj.misses`` in the cache counters."""
+    _watched[name] = obj
+
+
+class CountedCache:
+    """A Streamlit-cached function that counts its own hits and misses (see ``counted``)."""
+
+    def __init__(self, fn, cache):
+        self.calls = self.misses = 0
+        self._lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def miss(*args, **kwargs):
+            # Only runs when the cache has no entry for these arguments
+            with self._lock: self.misses += 1
+            return fn(*args, **kwargs)
+
+        self._cached = cache(miss)
+        functools.update_wrapper(self, fn)
+
+    @property
+    def hits(self):
+        return self.calls - self.misses
+
+    def __call__(self, *args, **kwargs):
+        with self._lock: self.calls += 1
+        return self._cached(*args, **kwargs)
+
+    def clear(self):
+        self._cached.clear()
+
+
+def counted(cache):
+    """Decorator: apply ``cache`` (e.g. ``st.cache_resource(max_entries=4)``) and count hits and misses.
+
+    Streamlit's caches don't expose counters, so calls are counted outside the
+    cache and misses inside it; the result is ``watch``ed as ``<module>.<function>``.
+    """
+    def wrap(fn):
+        cached = CountedCache(fn, cache)
+        watch(f"{fn.__module__.removeprefix('tools.')}.{fn.__name__}", cached)
+        return cached
+    return wrap
+
+
+def cache_counters():
+    """{name: (hits, misses)} for every lru_cache in loaded ``tools`` modules and every watched object."""
+    out = {}
+    for mod_name, mod in list(sys.modules.items()):
+        if not mod_name.startswith("tools.") or mod is None: continue
+        for attr, fn in list(vars(mod).items()):
+            info = getattr(fn, "cache_info", None)
+            if callable(info) and getattr(fn, "__module__", None) == mod_name:
+                ci = info()
+                out[f"{mod_name[6:]}.{attr}"] = (ci.hits, ci.misses)
+    for name, obj in list(_watched.items()):
+        out[name] = (obj.hits, obj.misses)
+    return out
+
+
+def _sum(counters):
+    return sum(h for h, _ in counters.values()), sum(m for _, m in counters.values())
+
+
+def run(name, fn, profile=False):
+    """Call ``fn`` (a tool's render) and record its stats under ``name``.
+
+    With ``profile`` the call runs under cProfile and the ``pstats.Stats`` is
+    returned; otherwise returns None.
+    """
+    hits0, misses0 = _sum(cache_counters())
+    if TRACE_MEMORY:
+        mem0 = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    prof = cProfile.Profile() if profile else None
+    failed = False
+    t0 = time.perf_counter()
+    try:
+        if prof: prof.runcall(fn)
+        else: fn()
+    except Exception:
+        failed = True
+        raise
+    finally:
+        dt = time.perf_counter() - t0
+        if TRACE_MEMORY: cur, peak = tracemalloc.get_traced_memory()
+        hits1, misses1 = _sum(cache_counters())
+        with _lock:
+            s = _stats.setdefault(name, ToolStats())
+            s.runs += 1
+            s.errors += failed
+            s.seconds += dt
+            s.recent.append(dt)
+            s.hits += hits1 - hits0
+            s.misses += misses1 - misses0
+            if TRACE_MEMORY:
+                s.last_peak_bytes, s.last_net_bytes = peak - mem0, cur - mem0
+                s.peak_bytes = max(s.peak_bytes, s.last_peak_bytes)
+    return pstats.Stats(prof) if prof else None
+
+
+def snapshot():
+    with _lock: return {name: s.as_dict() for name, s in sorted(_stats.items())}
+
+
+def to_json():
+    return json.dumps({"generated": time.time(), "memory_traced": TRACE_MEMORY, "tools": snapshot(),
+                       "caches": {k: {"hits": h, "misses": m} for k, (h, m) in sorted(cache_counters().items())}}, indent=2)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus():
+    """Prometheus text exposition (version 0.0.4) of the current stats."""
+    tools = snapshot()
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.extend([f"# HELP {PREFIX}_{name} {help_text}", f"# TYPE {PREFIX}_{name} {kind}"])
+        lines.extend(f"{PREFIX}_{suffix}{{{labels}}} {value}" for suffix, labels, value in samples)
+
+    metric("render_seconds", "summary", "Wall time of one tool rerun.",
+           [s for t, d in tools.items() for s in (
+               ("render_seconds", f'tool="{_label(t)}",quantile="0.5"', d["p50_s"]),
+               ("render_seconds", f'tool="{_label(t)}",quantile="0.95"', d["p95_s"]),
+               ("render_seconds_sum", f'tool="{_label(t)}"', d["seconds_total"]),
+               ("render_seconds_count", f'tool="{_label(t)}"', d["runs"]))])
+    metric("render_errors_total", "counter", "Tool reruns that raised.",
+           [("render_errors_total", f'tool="{_label(t)}"', d["errors"]) for t, d in tools.items()])
+    if TRACE_MEMORY:
+        metric("render_peak_bytes", "gauge", "Largest tracemalloc peak seen during one rerun.",
+               [("render_peak_bytes", f'tool="{_label(t)}"', d["peak_bytes"]) for t, d in tools.items()])
+    metric("cache_hits_total", "counter", "Cache hits during a tool's reruns.",
+           [("cache_hits_total", f'tool="{_label(t)}"', d["cache_hits"]) for t, d in tools.items()])
+    metric("cache_misses_total", "counter", "Cache misses during a tool's reruns.",
+           [("cache_misses_total", f'tool="{_label(t)}"', d["cache_misses"]) for t, d in tools.items()])
+    return "\n".join(lines) + "\n"
+
+
+# --- UI ---
+
+def admin_requested():
+    if not ENABLED: return False
+    value = st.query_params.get("admin")
+    return bool(value) and value == (ADMIN_TOKEN or "1")
+
+
+def render_tool(name, fn):
+    """Run a tool's render, instrumented when enabled; profiles it if the admin panel asked to."""
+    if not ENABLED:
+        fn()
+        return
+    profile = st.session_state.pop("instrument_profile_next", False)
+    stats = run(name, fn, profile)
+    if stats:
+        buf = io.StringIO()
+        stats.stream = buf
+        stats.sort_stats("cumulative").print_stats(40)
+        st.session_state.instrument_profile = (name, buf.getvalue())
+
+
+def admin_panel():
+    with st.sidebar.expander("🛠️ Instrumentation", expanded=True):
+        tools = snapshot()
+        if tools:
+            st.dataframe([{"Tool": t, "Runs": d["runs"], "p50 ms": round(d["p50_s"] * 1000, 1),
+                           "p95 ms": round(d["p95_s"] * 1000, 1), "Peak MB": round(d["peak_bytes"] / 2**20, 2),
+                           "Hits": d["cache_hits"], "Misses": d["cache_misses"], "Errors": d["errors"]}
+                          for t, d in tools.items()], hide_index=True)
+        else: st.caption("No reruns recorded yet.")
+        if not TRACE_MEMORY: st.caption("Memory tracing is off (`INSTRUMENT_MEMORY`).")
+        c1, c2 = st.columns(2)
+        with c1: st.download_button("JSON", to_json(), "metrics.json", "application/json")
+        with c2: st.download_button("Prometheus", to_prometheus(), "metrics.prom", "text/plain")
+        if st.button("Profile next rerun"):
+            st.session_state.instrument_profile_next = True
+            st.rerun()
+        prof = st.session_state.get("instrument_profile")
+        if prof:
+            st.caption(f"cProfile: {prof[0]}")
+            st.code(prof[1], language=None)
+        if TRACE_MEMORY and st.button("Top allocations"):
+            top = tracemalloc.take_snapshot().statistics("lineno")[:15]
+            st.code("\n".join(f"{s.size / 1024:9.1f} KiB  {s.traceback}" for s in top), language=None)
+        if st.button("Reset stats"):
+            with _lock: _stats.clear()
+            st.session_state.pop("instrument_profile", None)
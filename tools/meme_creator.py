@@ -0,0 +1,156 @@
+import streamlit as st
+import requests
+from functools import lru_cache
+from PIL import Image, ImageDraw
+
+from tools.export import export_image_button, make_proxy, proxy_scale
+from tools.instrumentation import counted
+from tools.meme_templates import available_templates, get_font, load_template
+
+# Caption boxes as fractions of the image: each may use this much of the height
+BOX_HEIGHT = 0.25
+MAX_FONT = 0.1  # of image height, the size captions had before wrapping
+MIN_FONT_PX = 10
+MARGIN = 0.02
+
+
+def _split_word(word, font, width):
+    """Break ``word`` into pieces no wider than ``width`` px (at least one character each)."""
+    pieces = []
+    while font.getlength(word) > width and len(word) > 1:
+        lo, hi = 1, len(word) - 1  # longest prefix that fits, by binary search
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if font.getlength(word[:mid]) <= width: lo = mid
+            else: hi = mid - 1
+        pieces.append(word[:lo])
+        word = word[lo:]
+    return pieces + [word]
+
+
+def _wrap(txt, font, width, break_words=False):
+    """Greedy word wrap of ``txt`` into lines no wider than ``width`` px.
+
+    A word wider than a line is broken by characters with ``break_words``;
+    otherwise the result is None.
+    """
+    lines, line = [], ""
+    for word in txt.split():
+        trial = f"{line} {word}".strip()
+        if font.getlength(trial) <= width:
+            line = trial
+            continue
+        if font.getlength(word) > width:
+            if not break_words: return None
+            *full, word = _split_word(word, font, width)
+            if line: lines.append(line)
+            lines.extend(full)
+        elif line: lines.append(line)
+        line = word
+    return lines + [line] if line else lines
+
+
+@lru_cache(maxsize=256)
+def fit_text(txt, width, height, max_size, stroke):
+    """Largest font size (binary search) whose wrapped ``txt`` fits ``width`` x ``height``.
+
+    Returns (size, lines). Words are only broken (e.g. long URLs) when no size
+    fits them whole; if nothing fits the height either, the minimum size is
+    used and the text runs past the box downwards, never sideways.
+    """
+    def layout(size, break_words):
+        font = get_font(size)
+        lines = _wrap(txt, font, width - 2 * stroke, break_words)
+        if lines is None: return None
+        ascent, descent = font.getmetrics()
+        return lines if len(lines) * (ascent + descent + stroke) <= height else None
+
+    for break_words in (False, True):
+        lo, hi, best = MIN_FONT_PX, max(MIN_FONT_PX, max_size), None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            lines = layout(mid, break_words)
+            if lines is not None: best, lo = (mid, lines), mid + 1
+            else: hi = mid - 1
+        if best: return best
+    return MIN_FONT_PX, _wrap(txt, get_font(MIN_FONT_PX), width - 2 * stroke, True)
+
+
+@counted(st.cache_resource(max_entries=64))
+def text_layer(lines, size, color, width, stroke):
+    """Transparent RGBA strip with ``lines`` centred, cached by text, font size and colour."""
+    font = get_font(size)
+    ascent, descent = font.getmetrics()
+    line_h = ascent + descent + stroke
+    layer = Image.new("RGBA", (width, line_h * len(lines) + stroke), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    for i, line in enumerate(lines):
+        x = (width - font.getlength(line)) / 2
+        draw.text((x, i * line_h + stroke), line, font=font, fill=color, stroke_width=stroke, stroke_fill="black")
+    return layer
+
+
+def caption_layer(txt, img_size, color, scale=1.0):
+    w, h = img_size
+    stroke = max(1, round(3*scale))
+    margin = round(h * MARGIN)
+    size, lines = fit_text(txt, w - 2 * margin, int(h * BOX_HEIGHT), int(h * MAX_FONT), stroke)
+    return text_layer(tuple(lines), size, color, w, stroke)
+
+
+def compose(img, top, bot, col, scale=1.0):
+    """Return a copy of ``img`` with the caption layers composited on. ``scale`` is the proxy factor.
+
+    Only a caption whose text, size or colour changed is re-rendered; the rest
+    come from the layer cache.
+    """
+    out = img.copy()
+    margin = round(img.height * MARGIN)
+    if top.strip():
+        out.alpha_composite(caption_layer(top, img.size, col, scale), (0, margin))
+    if bot.strip():
+        layer = caption_layer(bot, img.size, col, scale)
+        out.alpha_composite(layer, (0, max(0, img.height - layer.height - margin)))
+    return out
+
+
+@counted(st.cache_resource(max_entries=8))
+def load_upload(file_id, _upload):
+    return Image.open(_upload).convert("RGBA")
+
+
+@counted(st.cache_resource(max_entries=8))
+def preview_base(img_id, _img):
+    """Preview-sized copy of a template/upload, built once per image."""
+    return make_proxy(_img)
+
+
+def render():
+    st.markdown("<h1 class='main-title'>Meme Creator</h1>", unsafe_allow_html=True)
+    
+    c1, c2 = st.columns([1, 1.5], gap="medium")
+    with c1:
+        src = st.radio("Source", ["Templates", "Upload"], horizontal=True)
+        img = None
+        if src == "Templates":
+            templates = available_templates()
+            t_name = st.selectbox("Template", list(templates))
+            if t_name:
+                img_id = templates[t_name]
+                try: img = load_template(img_id)
+                except requests.RequestException:
+                    st.error("⚠️ Couldn't download this template. Offline templates are still available.")
+        else:
+            u = st.file_uploader("Upload", type=["jpg", "png"])
+            if u:
+                img_id = u.file_id
+                img = load_upload(img_id, u)
+            
+        top = st.text_input("Top Text", "WHEN THE CODE")
+        bot = st.text_input("Bottom Text", "WORKS FIRST TRY")
+        col = st.color_picker("Color", "#FFFFFF")
+        
+    with c2:
+        if img:
+            st.image(compose(preview_base(img_id, img), top, bot, col, proxy_scale(img)), use_column_width=True)
+            export_image_button("Download Meme", "meme", (img_id, top, bot, col), lambda: compose(img, top, bot, col), "meme")
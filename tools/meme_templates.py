@@ -0,0 +1,122 @@
+"""Meme template and font loading for the Meme Creator.
+
+Templates are looked up in order: in-memory decoded cache, the bundled
+offline pack (``assets/meme_templates``), the on-disk download cache, and
+only then the network through a pooled ``requests.Session``. The disk cache
+is an LRU bounded by total size.
+
+To refresh the offline pack from the remote templates:
+
+    python -m tools.meme_templates
+"""
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from io import BytesIO
+
+import requests
+import streamlit as st
+from PIL import Image, ImageFont
+from requests.adapters import HTTPAdapter
+
+from tools.config import setting
+from tools.instrumentation import counted
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACK_DIR = os.path.join(ROOT, "assets", "meme_templates")
+CACHE_DIR = setting("MEME_CACHE_DIR", os.path.join(ROOT, ".cache", "memes"))
+CACHE_MAX_BYTES = setting("MEME_CACHE_MAX_MB", 50, int) * 1024 * 1024
+TIMEOUT = (3.05, 10)  # (connect, read) seconds
+FONT_FILES = ["arial.ttf", "Arial.ttf", "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf"]
+
+TEMPLATES = {
+    "Drake": "https://i.imgflip.com/30b1gx.jpg",
+    "Distracted Boyfriend": "https://i.imgflip.com/1ur9b0.jpg",
+}
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=2))
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=2))
+_disk_lock = threading.Lock()
+
+
+def available_templates():
+    """Name -> source (URL or bundled file path): the remote list plus any extra pack files."""
+    out = dict(TEMPLATES)
+    known = {os.path.basename(u) for u in TEMPLATES.values()}
+    if os.path.isdir(PACK_DIR):
+        for fn in sorted(os.listdir(PACK_DIR)):
+            if fn not in known and fn.lower().endswith((".jpg", ".jpeg", ".png")):
+                out[os.path.splitext(fn)[0].replace("_", " ").title()] = os.path.join(PACK_DIR, fn)
+    return out
+
+
+def _cache_path(url):
+    ext = os.path.splitext(url)[1] or ".img"
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ext)
+
+
+def _evict():
+    # Least recently used = oldest mtime (hits touch the file)
+    entries = [e for e in os.scandir(CACHE_DIR) if e.is_file()]
+    total = sum(e.stat().st_size for e in entries)
+    for e in sorted(entries, key=lambda e: e.stat().st_mtime):
+        if total <= CACHE_MAX_BYTES: break
+        total -= e.stat().st_size
+        try: os.remove(e.path)
+        except OSError: pass
+
+
+def fetch_bytes(url):
+    """Raw template bytes from the offline pack, the disk cache, or the network."""
+    packed = os.path.join(PACK_DIR, os.path.basename(url))
+    if os.path.isfile(packed):
+        with open(packed, "rb") as fl: return fl.read()
+    path = _cache_path(url)
+    with _disk_lock:
+        if os.path.isfile(path):
+            os.utime(path)
+            with open(path, "rb") as fl: return fl.read()
+    resp = _session.get(url, timeout=TIMEOUT)
+    resp.raise_for_status()
+    data = resp.content
+    with _disk_lock:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fl: fl.write(data)
+        os.replace(tmp, path)
+        _evict()
+    return data
+
+
+@counted(st.cache_resource(max_entries=16))
+def load_template(source):
+    """Decoded RGBA template for a URL or a bundled file path, shared across sessions.
+
+    Callers must not draw on the returned image in place.
+    """
+    if os.path.isfile(source):
+        img = Image.open(source)
+    else:
+        img = Image.open(BytesIO(fetch_bytes(source)))
+    return img.convert("RGBA")
+
+
+@lru_cache(maxsize=64)
+def get_font(size):
+    """First available TrueType font at ``size`` px, falling back to Pillow's built-in font."""
+    for fn in FONT_FILES:
+        try: return ImageFont.truetype(fn, size)
+        except OSError: continue
+    try: return ImageFont.load_default(size)
+    except TypeError: return ImageFont.load_default()  # Pillow < 10.1
+
+
+if __name__ == "__main__":
+    os.makedirs(PACK_DIR, exist_ok=True)
+    for name, url in TEMPLATES.items():
+        resp = _session.get(url, timeout=TIMEOUT)
+        resp.raise_for_status()
+        with open(os.path.join(PACK_DIR, os.path.basename(url)), "wb") as fl: fl.write(resp.content)
+        print(f"{name}: {len(resp.content) // 1024} KB")
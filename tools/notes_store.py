@@ -0,0 +1,154 @@
+"""SQLite-backed notes for Quick Notes.
+
+Notes persist across sessions in a shared ``SQLiteStore`` database, like the
+expense ledger. An external-content FTS5 index, kept in
+sync by triggers, makes search an index lookup rather than a scan. Tags sit
+in their own (tag, note) table, so filtering by tag is indexed too. Every
+read is a single LIMITed page, and tag counts come from a trigger-maintained
+rollup, so rendering cost doesn't grow with the number of notes.
+
+Timestamps are stored as ISO 8601 UTC, so text order is time order.
+"""
+import re
+from datetime import datetime, timezone
+
+from tools.sqlite_store import SQLiteStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,       -- ISO 8601 UTC
+    body TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT ''  -- space separated, for display and search
+);
+CREATE INDEX IF NOT EXISTS idx_notes_created ON notes(created);
+CREATE TABLE IF NOT EXISTS note_tags (
+    tag TEXT NOT NULL,
+    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, note_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_note_tags_note ON note_tags(note_id);
+CREATE TABLE IF NOT EXISTS tag_counts (
+    tag TEXT PRIMARY KEY,
+    n INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tag_counts_n ON tag_counts(n DESC, tag);
+CREATE TRIGGER IF NOT EXISTS note_tags_ai AFTER INSERT ON note_tags BEGIN
+    INSERT INTO tag_counts(tag, n) VALUES (new.tag, 1) ON CONFLICT(tag) DO UPDATE SET n = n + 1;
+END;
+-- Also fires for rows removed by the ON DELETE CASCADE from notes
+CREATE TRIGGER IF NOT EXISTS note_tags_ad AFTER DELETE ON note_tags BEGIN
+    UPDATE tag_counts SET n = n - 1 WHERE tag = old.tag;
+    DELETE FROM tag_counts WHERE tag = old.tag AND n <= 0;
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    body, tags, content='notes', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts(rowid, body, tags) VALUES (new.id, new.body, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts(notes_fts, rowid, body, tags) VALUES ('delete', old.id, old.body, old.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE ON notes BEGIN
+    INSERT INTO notes_fts(notes_fts, rowid, body, tags) VALUES ('delete', old.id, old.body, old.tags);
+    INSERT INTO notes_fts(rowid, body, tags) VALUES (new.id, new.body, new.tags);
+END;
+"""
+
+# Marks around search hits in ``highlight``; control characters can't clash with note text once escaped
+HIT_START, HIT_END = "\x02", "\x03"
+_HASHTAG = re.compile(r"(?<![\w&])#(\w[\w-]*)")
+
+
+def parse_tags(text, body=""):
+    """Sorted unique tags from a comma/space separated string plus any ``#hashtags`` in ``body``."""
+    tags = {t.lstrip("#").lower() for t in re.split(r"[,\s]+", text or "") if t.lstrip("#")}
+    tags.update(t.lower() for t in _HASHTAG.findall(body or ""))
+    return sorted(tags)
+
+
+def fts_query(text):
+    """User input -> FTS5 query: every word must match, each as a prefix."""
+    return " ".join(f'"{w}"*' for w in re.findall(r"\w+", text or ""))
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class NotesStore(SQLiteStore):
+    PRAGMAS = SQLiteStore.PRAGMAS + ("foreign_keys=ON",)  # note_tags rows go with their note
+
+    def __init__(self, path):
+        super().__init__(path, _SCHEMA)
+        # Databases from before the tag rollup existed: build it once
+        if self.conn.execute("SELECT NOT EXISTS(SELECT 1 FROM tag_counts) AND EXISTS(SELECT 1 FROM note_tags)").fetchone()[0]:
+            with self.conn:
+                self.conn.execute("INSERT INTO tag_counts SELECT tag, COUNT(*) FROM note_tags GROUP BY tag")
+
+    # --- Writes ---
+
+    def add(self, body, tags=(), created=None):
+        return self.add_many([(body, tags, created)])[0]
+
+    def add_many(self, rows):
+        """Insert (body, tags, created or None) tuples in one transaction; returns the new ids."""
+        ids = []
+        with self.conn:
+            for body, tags, created in rows:
+                tags = parse_tags(" ".join(tags) if not isinstance(tags, str) else tags, body)
+                cur = self.conn.execute("INSERT INTO notes(created, body, tags) VALUES (?, ?, ?)",
+                                        (created or now(), body, " ".join(tags)))
+                self.conn.executemany("INSERT INTO note_tags(tag, note_id) VALUES (?, ?)", [(t, cur.lastrowid) for t in tags])
+                ids.append(cur.lastrowid)
+        return ids
+
+    def delete(self, note_id):
+        with self.conn: self.conn.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM note_tags")
+            self.conn.execute("DELETE FROM notes")
+            self.conn.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+
+    # --- Reads ---
+
+    def _where(self, query, tag):
+        sql, params = [], []
+        if fts_query(query):
+            sql.append("n.id IN (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ?)")
+            params.append(fts_query(query))
+        if tag:
+            sql.append("n.id IN (SELECT note_id FROM note_tags WHERE tag = ?)")
+            params.append(tag)
+        return (" WHERE " + " AND ".join(sql)) if sql else "", params
+
+    def count(self, query=None, tag=None):
+        where, params = self._where(query, tag)
+        return self.conn.execute(f"SELECT COUNT(*) FROM notes n{where}", params).fetchone()[0]
+
+    def page(self, limit=20, offset=0, query=None, tag=None):
+        """One page of notes as dicts, newest first, or best match first when searching.
+
+        When searching, ``body`` has each hit wrapped in ``HIT_START``/``HIT_END``.
+        """
+        q = fts_query(query)
+        if q:
+            sql = ("SELECT n.id, n.created, highlight(notes_fts, 0, ?, ?), n.tags FROM notes_fts "
+                   "JOIN notes n ON n.id = notes_fts.rowid WHERE notes_fts MATCH ?")
+            params = [HIT_START, HIT_END, q]
+            if tag:
+                sql += " AND n.id IN (SELECT note_id FROM note_tags WHERE tag = ?)"
+                params.append(tag)
+            sql += " ORDER BY rank, n.id DESC LIMIT ? OFFSET ?"
+        else:
+            where, params = self._where(None, tag)
+            sql = f"SELECT n.id, n.created, n.body, n.tags FROM notes n{where} ORDER BY n.created DESC, n.id DESC LIMIT ? OFFSET ?"
+        rows = self.conn.execute(sql, params + [limit, offset]).fetchall()
+        return [{"id": i, "created": c, "body": b, "tags": t.split()} for i, c, b, t in rows]
+
+    def tags(self):
+        """[(tag, note count)], most used first; read from the rollup, not by counting notes."""
+        return self.conn.execute("SELECT tag, n FROM tag_counts ORDER BY n DESC, tag").fetchall()
@@ -0,0 +1,206 @@
+"""PDF processing for PDF Tools, kept free of UI code.
+
+Uploads are spooled to a temp file named by content hash, so worker
+processes can open the same document by path instead of receiving its bytes,
+and repeat requests for the same file skip parsing entirely.
+
+Page operations (merge, split, extract, rotate, compress) copy page objects
+into a ``PdfWriter`` rather than re-rendering them, and write straight to a
+file, so large documents never need every page decoded at once.
+"""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from itertools import repeat
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+SPOOL_DIR = os.path.join(tempfile.gettempdir(), "utility_apps_pdf")
+
+
+def digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def spool(data, spool_dir=SPOOL_DIR):
+    """Write ``data`` to ``spool_dir`` once; return (digest, path)."""
+    d = digest(data)
+    path = os.path.join(spool_dir, f"{d}.pdf")
+    if not os.path.isfile(path):
+        os.makedirs(spool_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fl: fl.write(data)
+        os.replace(tmp, path)
+    return d, path
+
+
+@lru_cache(maxsize=8)
+def _cached_reader(path):
+    return PyPDF2.PdfReader(path), threading.RLock()
+
+
+@contextmanager
+def open_reader(path):
+    """Per-process reader for ``path``, held exclusively for the ``with`` block.
+
+    PyPDF2 parses page objects lazily, seeking the one shared file stream as
+    it goes, so concurrent script threads using the same reader would corrupt
+    each other's reads. Everything that touches the reader or its pages
+    (including ``PdfWriter.write`` of copied pages) must stay inside the block.
+    """
+    reader, lock = _cached_reader(path)
+    with lock: yield reader
+
+
+def page_count(path):
+    with open_reader(path) as reader: return len(reader.pages)
+
+
+def _extract_chunk(path, pages):
+    with open_reader(path) as reader:
+        return [(i, reader.pages[i].extract_text() or "") for i in pages]
+
+
+def _chunks(pages, size):
+    for i in range(0, len(pages), size): yield pages[i:i + size]
+
+
+def iter_page_text(path, pages, pool=None, chunk=8, cache=None):
+    """Yield (page index, text) for ``pages`` in order, as each becomes available.
+
+    Pages already in ``cache`` (a dict) are yielded without reparsing, and new
+    results are stored there. With ``pool`` the remaining pages are fanned out
+    in chunks across worker processes.
+
+    The cache may be shared with other sessions extracting the same document,
+    so whether a page is fetched is decided once, from the ``todo`` snapshot;
+    re-checking the live cache would put ``fresh`` out of step when another
+    session fills a page in meanwhile.
+    """
+    cache = {} if cache is None else cache
+    todo = [i for i in pages if i not in cache]
+    fetch = set(todo)
+    if pool is None:
+        results = (_extract_chunk(path, c) for c in _chunks(todo, chunk))
+    else:
+        # map() keeps submission order, so pages still come out in sequence
+        results = pool.map(_extract_chunk, repeat(path), _chunks(todo, chunk))
+    fresh = (r for res in results for r in res)
+    for i in pages:
+        if i in fetch:
+            j, text = next(fresh)
+            cache[j] = text
+            yield j, text
+        else: yield i, cache[i]
+
+
+# --- Page operations ---
+
+def parse_ranges(spec, n_pages):
+    """``"1-3, 5, 8-"`` -> [0, 1, 2, 4, 7, ..., n_pages - 1] (1-based, inclusive, in the order given)."""
+    pages = []
+    for part in spec.replace(" ", "").split(","):
+        if not part: continue
+        m = re.fullmatch(r"(\d*)-(\d*)|(\d+)", part)
+        if not m: raise ValueError(f"Bad page range: {part!r}")
+        if m.group(3): lo = hi = int(m.group(3))
+        else: lo, hi = int(m.group(1) or 1), int(m.group(2) or n_pages)
+        if not 1 <= lo <= hi <= n_pages: raise ValueError(f"Pages {part} outside 1-{n_pages}")
+        pages.extend(range(lo - 1, hi))
+    return pages
+
+
+def _write(writer, out_path):
+    with open(out_path, "wb") as fl: writer.write(fl)
+    return out_path
+
+
+def merge(paths, out_path):
+    """Concatenate whole documents in order."""
+    writer = PyPDF2.PdfWriter()
+    with ExitStack() as stack:
+        # Lock in a fixed order so two merges of the same files can't deadlock
+        readers = {p: stack.enter_context(open_reader(p)) for p in sorted(set(paths))}
+        for path in paths:
+            for page in readers[path].pages: writer.add_page(page)
+        return _write(writer, out_path)
+
+
+def extract_pages(path, pages, out_path, rotate=0):
+    """New document with ``pages`` (0-based, any order), optionally rotated clockwise by ``rotate`` degrees."""
+    writer = PyPDF2.PdfWriter()
+    with open_reader(path) as reader:
+        for i in pages:
+            page = writer.add_page(reader.pages[i])
+            if rotate: page.rotate(rotate)
+        return _write(writer, out_path)
+
+
+def rotate_pages(path, pages, degrees, out_path):
+    """Whole document with ``pages`` rotated by ``degrees``; other pages untouched."""
+    writer, chosen = PyPDF2.PdfWriter(), set(pages)
+    with open_reader(path) as reader:
+        for i, p in enumerate(reader.pages):
+            page = writer.add_page(p)
+            if i in chosen: page.rotate(degrees)
+        return _write(writer, out_path)
+
+
+def split(path, every, out_zip, stem="part"):
+    """Split into chunks of ``every`` pages, each written straight into ``out_zip``."""
+    with open_reader(path) as reader, zipfile.ZipFile(out_zip, "w", zipfile.ZIP_STORED) as zf:
+        n = len(reader.pages)
+        for k, start in enumerate(range(0, n, every), 1):
+            writer = PyPDF2.PdfWriter()
+            for i in range(start, min(n, start + every)): writer.add_page(reader.pages[i])
+            # PdfWriter needs a seekable stream, so each part goes through a temp file
+            part = f"{out_zip}.part"
+            _write(writer, part)
+            zf.write(part, f"{stem}_{k:03d}.pdf")
+            os.remove(part)
+    return out_zip
+
+
+def compress(path, out_path):
+    """Re-write with Flate-compressed content streams."""
+    # Compress on a private reader before copying: compressing the writer's copy
+    # would leave the original streams in the output as orphans
+    writer = PyPDF2.PdfWriter()
+    for p in PyPDF2.PdfReader(path).pages:
+        p.compress_content_streams()
+        writer.add_page(p)
+    return _write(writer, out_path)
+
+
+# --- Search ---
+
+_WORD = re.compile(r"\w+")
+
+
+def build_index(page_texts):
+    """Inverted index word -> sorted page indices, from an iterable of (page, text)."""
+    index = {}
+    for i, text in page_texts:
+        for word in set(_WORD.findall(text.lower())):
+            index.setdefault(word, []).append(i)
+    return index
+
+
+def search(index, query):
+    """Pages containing every word in ``query`` (AND), using the index only."""
+    words = set(_WORD.findall(query.lower()))
+    if not words: return []
+    hits = None
+    for w in words:
+        pages = set(index.get(w, ()))
+        hits = pages if hits is None else hits & pages
+        if not hits: return []
+    return sorted(hits)
@@ -0,0 +1,186 @@
+import streamlit as st
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+from tools import artifacts, pdf_engine
+from tools.config import setting
+from tools.delivery import file_download
+from tools.instrumentation import counted
+from tools.pools import WORKER_CRASHED, SharedPool
+
+PyPDF2 = pdf_engine.PyPDF2
+PDF_WORKERS = setting("PDF_WORKERS", min(4, os.cpu_count() or 1), int)
+PAGES_PER_VIEW = 5
+# Uploads live with the other artifacts, so the same age and size limits clear them out
+SPOOL_DIR = os.path.join(artifacts.ARTIFACTS_DIR, "pdf_uploads")
+
+
+@st.cache_resource
+def get_pool():
+    return SharedPool(PDF_WORKERS)
+
+
+@st.cache_resource(max_entries=16)
+def text_cache(digest):
+    """Extracted text by page index for one document, shared across sessions and reruns."""
+    return {}
+
+
+@counted(st.cache_resource(max_entries=32))
+def word_index(digest, _path):
+    """Inverted word index for one document, built once (reusing any extracted text)."""
+    n = pdf_engine.page_count(_path)
+    return pdf_engine.build_index(pdf_engine.iter_page_text(_path, range(n), cache=text_cache(digest)))
+
+
+def _out_path(name):
+    return artifacts.new_path("pdf", name)
+
+
+def _stem(doc):
+    return os.path.splitext(doc["name"])[0]
+
+
+def render_extract(doc):
+    digest, path, n_pages = doc["digest"], doc["path"], doc["pages"]
+    cache = text_cache(digest)
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        first, last = st.slider("Pages", 1, n_pages, (1, n_pages)) if n_pages > 1 else (1, 1)
+    with c2:
+        parallel = st.checkbox("Parallel", help=f"Spread pages over {PDF_WORKERS} processes")
+    pages = list(range(first - 1, last))
+
+    if st.button("Extract Text"):
+        todo = sum(i not in cache for i in pages)
+        if todo:
+            bar = st.progress(0.0, text=f"0 / {len(pages)} pages")
+            pool = get_pool() if parallel and todo > 8 else None
+            try:
+                for k, _ in enumerate(pdf_engine.iter_page_text(path, pages, pool, cache=cache), 1):
+                    if k % 4 == 0 or k == len(pages): bar.progress(k / len(pages), text=f"{k} / {len(pages)} pages")
+            except BrokenProcessPool:
+                st.error(WORKER_CRASHED)
+                return
+        st.session_state.pdf_view = (digest, first, last)
+
+    view = st.session_state.get("pdf_view")
+    if not view or view[0] != digest: return
+    _, first, last = view
+    pages = [i for i in range(first - 1, last) if i in cache]
+    n_views = (len(pages) + PAGES_PER_VIEW - 1) // PAGES_PER_VIEW
+    if n_views > 1:
+        v = st.number_input(f"View (of {n_views})", 1, n_views, 1)
+    else: v = 1
+    # Only the visible slice becomes widgets; the rest stays in the cache
+    for i in pages[(v - 1) * PAGES_PER_VIEW:v * PAGES_PER_VIEW]:
+        st.text_area(f"Page {i + 1}", cache[i], height=250, key=f"pdf_page_{digest}_{i}")
+    st.download_button("⬇️ Download Text", lambda: "\n\n".join(cache[i] for i in pages),
+                       f"pages_{first}-{last}.txt", "text/plain")
+
+
+def render_merge(docs):
+    order = st.multiselect("Documents (merged in this order)", list(docs), default=list(docs),
+                           format_func=lambda k: docs[k]["label"])
+    if st.button("Merge") and order:
+        with st.spinner("Merging..."):
+            out = pdf_engine.merge([docs[k]["path"] for k in order], _out_path("merged.pdf"))
+        st.session_state.pdf_result = ("merge", out)
+    _offer_result("merge")
+
+
+def render_split(doc):
+    every = st.number_input("Pages per part", 1, max(1, doc["pages"]), min(10, doc["pages"]))
+    if st.button("Split"):
+        with st.spinner("Splitting..."):
+            out = pdf_engine.split(doc["path"], int(every), _out_path(f"{_stem(doc)}_parts.zip"), _stem(doc))
+        st.session_state.pdf_result = ("split", out)
+    _offer_result("split")
+
+
+def render_pages(doc):
+    spec = st.text_input("Pages", f"1-{doc['pages']}", help="e.g. 1-3, 5, 8-")
+    c1, c2 = st.columns(2)
+    with c1: action = st.radio("Action", ["Extract selected pages", "Rotate selected pages"])
+    with c2: degrees = st.selectbox("Rotate by", [0, 90, 180, 270], index=1 if "Rotate" in action else 0)
+    if st.button("Apply"):
+        try: pages = pdf_engine.parse_ranges(spec, doc["pages"])
+        except ValueError as e:
+            st.error(str(e))
+            return
+        with st.spinner("Writing..."):
+            if action.startswith("Extract"):
+                out = pdf_engine.extract_pages(doc["path"], pages, _out_path(f"{_stem(doc)}_pages.pdf"), degrees)
+            else:
+                out = pdf_engine.rotate_pages(doc["path"], pages, degrees, _out_path(f"{_stem(doc)}_rotated.pdf"))
+        st.session_state.pdf_result = ("pages", out)
+    _offer_result("pages")
+
+
+def render_compress(doc):
+    if st.button("Compress"):
+        with st.spinner("Compressing..."):
+            out = pdf_engine.compress(doc["path"], _out_path(f"{_stem(doc)}_compressed.pdf"))
+        before, after = os.path.getsize(doc["path"]), os.path.getsize(out)
+        if after >= before:
+            os.remove(out)
+            st.info(f"Already compact ({before / 1024:.0f} KB); compressing would not make it smaller.")
+            return
+        st.success(f"{before / 1024:.0f} KB → {after / 1024:.0f} KB")
+        st.session_state.pdf_result = ("compress", out)
+    _offer_result("compress")
+
+
+def render_search(docs):
+    query = st.text_input("Search all uploaded PDFs")
+    if not query: return
+    missing = [d for d in docs.values() if d["digest"] not in st.session_state.setdefault("pdf_indexed", set())]
+    if missing:
+        with st.spinner(f"Indexing {len(missing)} document(s)..."):
+            for doc in missing:
+                word_index(doc["digest"], doc["path"])
+                st.session_state.pdf_indexed.add(doc["digest"])
+    total = 0
+    for doc in docs.values():
+        hits = pdf_engine.search(word_index(doc["digest"], doc["path"]), query)
+        if hits:
+            total += len(hits)
+            st.markdown(f"**{doc['label']}** — pages {', '.join(str(i + 1) for i in hits[:50])}{' …' if len(hits) > 50 else ''}")
+    if not total: st.info("No matches.")
+
+
+def _offer_result(tool):
+    # Only offer the file this tool produced, not one left over from another tool
+    tool_out = st.session_state.get("pdf_result")
+    if tool_out and tool_out[0] == tool and os.path.isfile(tool_out[1]):
+        file_download(f"⬇️ Download {os.path.basename(tool_out[1])}", tool_out[1])
+
+
+def render():
+    st.markdown("<h1 class='main-title'>PDF Tools</h1>", unsafe_allow_html=True)
+    if PyPDF2 is None: st.error("⚠️ `PyPDF2` missing.")
+    else:
+        files = st.file_uploader("Upload PDF", type="pdf", accept_multiple_files=True)
+        if files:
+            # Hash + spool once per upload, not on every rerun
+            spooled = st.session_state.setdefault("pdf_spooled", {})
+            # Keyed by upload, so two files with the same name stay separate
+            docs, seen = {}, {}
+            for f in files:
+                doc = spooled.get(f.file_id)
+                if doc is None or not os.path.isfile(doc["path"]):  # new, or pruned while idle
+                    artifacts.prune()
+                    digest, path = pdf_engine.spool(f.getvalue(), SPOOL_DIR)
+                    spooled[f.file_id] = {"name": f.name, "digest": digest, "path": path, "pages": pdf_engine.page_count(path)}
+                else: os.utime(doc["path"])  # still in use: keep it the newest
+                seen[f.name] = seen.get(f.name, 0) + 1
+                docs[f.file_id] = {**spooled[f.file_id], "label": f.name if seen[f.name] == 1 else f"{f.name} ({seen[f.name]})"}
+
+            tool = st.radio("Tool", ["Extract Text", "Merge", "Split", "Pages", "Compress", "Search"], horizontal=True)
+            if tool in ("Merge", "Search"):
+                (render_merge if tool == "Merge" else render_search)(docs)
+                return
+            key = st.selectbox("Document", list(docs), format_func=lambda k: docs[k]["label"]) if len(docs) > 1 else next(iter(docs))
+            doc = docs[key]
+            st.caption(f"{doc['pages']} pages")
+            {"Extract Text": render_extract, "Split": render_split, "Pages": render_pages, "Compress": render_compress}[tool](doc)
@@ -0,0 +1,117 @@
+import streamlit as st
+import hashlib
+from io import BytesIO
+from PIL import Image, ImageFilter
+
+from tools.export import export_image_button, make_proxy, proxy_scale
+from tools.instrumentation import counted
+
+# --- Filter pipeline ---
+# Every step takes (image, param, scale) and returns an RGB or RGBA image.
+# ``scale`` is the preview proxy factor, for steps measured in pixels. Alpha is
+# split off before the colour work and reattached afterwards, so L/P/RGBA
+# uploads all behave.
+
+_INVERT_LUT = [255 - i for i in range(256)] * 3
+_BW_LUT = [0] * 128 + [255] * 128
+# Classic sepia as a 3x4 colour matrix, evaluated in C by Image.convert (float32)
+_SEPIA = (0.393, 0.769, 0.189, 0,
+          0.349, 0.686, 0.168, 0,
+          0.272, 0.534, 0.131, 0)
+
+
+def _scale_lut(gain, pivot=0):
+    """LUT for ``pivot + (x - pivot) * gain``, clipped to 0..255 and repeated for R, G, B."""
+    return [min(255, max(0, round(pivot + (i - pivot) * gain))) for i in range(256)] * 3
+
+
+def _rgb_only(fn):
+    def step(img, param, scale):
+        if img.mode != "RGBA": return fn(img, param, scale)
+        rgb, alpha = img.convert("RGB"), img.getchannel("A")
+        out = fn(rgb, param, scale).convert("RGB")
+        out.putalpha(alpha)
+        return out
+    return step
+
+
+FILTERS = {
+    # name: (step function, slider spec (label, min, max, default) or None)
+    "Grayscale": (_rgb_only(lambda im, p, s: im.convert("L").convert("RGB")), None),
+    "Black & White": (_rgb_only(lambda im, p, s: im.convert("L").point(_BW_LUT).convert("RGB")), None),
+    "Sepia": (_rgb_only(lambda im, p, s: im.convert("RGB", _SEPIA)), None),
+    "Brightness": (_rgb_only(lambda im, p, s: im.point(_scale_lut(p))), ("Brightness", 0.2, 2.0, 1.2)),
+    "Contrast": (_rgb_only(lambda im, p, s: im.point(_scale_lut(p, 128))), ("Contrast", 0.2, 2.0, 1.2)),
+    "Blur": (lambda im, p, s: im.filter(ImageFilter.GaussianBlur(p * s)), ("Intensity", 1, 10, 2)),
+    "Sharpen": (lambda im, p, s: im.filter(ImageFilter.SHARPEN), None),
+    "Invert": (_rgb_only(lambda im, p, s: im.point(_INVERT_LUT)), None),
+}
+
+
+def normalize(img):
+    """Bring any decoded upload to RGB, or RGBA if it carries transparency."""
+    has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+    target = "RGBA" if has_alpha else "RGB"
+    return img if img.mode == target else img.convert(target)
+
+
+@counted(st.cache_resource(max_entries=4))
+def decode(digest, _data):
+    """Decoded, normalized upload, shared by every chain on the same image."""
+    img = Image.open(BytesIO(_data))
+    img.load()
+    return normalize(img)
+
+
+@counted(st.cache_resource(max_entries=4))
+def decode_proxy(digest, _data):
+    return make_proxy(decode(digest, _data))
+
+
+@counted(st.cache_resource(max_entries=16))
+def render_chain(digest, steps, _data, proxy=False):
+    """Apply ``steps`` ((name, param), ...) in order, reusing the cached result of every prefix.
+
+    Changing a later step's slider only recomputes from that step on. With
+    ``proxy`` the chain runs on the preview-sized copy.
+    """
+    if not steps: return decode_proxy(digest, _data) if proxy else decode(digest, _data)
+    prev = render_chain(digest, steps[:-1], _data, proxy)
+    name, param = steps[-1]
+    scale = proxy_scale(decode(digest, _data)) if proxy else 1.0
+    return FILTERS[name][0](prev, param, scale)
+
+
+def full_chain(digest, steps, data):
+    # Full-resolution render runs outside the caches: it is one-off and large
+    img = decode(digest, data)
+    for name, param in steps: img = FILTERS[name][0](img, param, 1.0)
+    return img
+
+
+def render():
+    st.markdown("<h1 class='main-title'>Photo Enhancer</h1>", unsafe_allow_html=True)
+    st.markdown("<p class='subtitle'>Apply professional grade filters and effects.</p>", unsafe_allow_html=True)
+    
+    uploaded_file = st.file_uploader("Upload Image", type=["jpg", "png", "jpeg"])
+    if uploaded_file:
+        data = uploaded_file.getvalue()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        c1, c2 = st.columns([1, 2], gap="large")
+        
+        with c1:
+            st.subheader("Settings")
+            chain = st.multiselect("Filters (applied in order)", list(FILTERS))
+            steps = []
+            for name in chain:
+                spec = FILTERS[name][1]
+                param = st.slider(spec[0], spec[1], spec[2], spec[3], key=f"pe_{name}") if spec else None
+                steps.append((name, param))
+
+        steps = tuple(steps)
+        preview = render_chain(digest, steps, data, proxy=True)
+        label = " → ".join(chain) or "Original"
+
+        with c2:
+            st.image(preview, caption=f"Result: {label}", use_column_width=True)
+            export_image_button("Download Image", "photo", (digest, steps), lambda: full_chain(digest, steps, data), "edited")
@@ -0,0 +1,65 @@
+"""Worker process pools shared by the batch tools.
+
+Workers are started with spawn so they don't inherit the Streamlit server's
+threads. A worker that dies (out of memory, killed) breaks its whole
+``ProcessPoolExecutor`` for good, so ``SharedPool`` drops a broken executor
+and starts a fresh one for the next caller: one crash fails one batch
+instead of every batch until the server restarts.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+WORKER_CRASHED = "A worker process crashed (out of memory?), so this batch stopped. Please try again."
+
+
+class SharedPool:
+    """A lazily started spawn process pool of ``workers`` processes that replaces itself when broken."""
+
+    def __init__(self, workers, initializer=None, initargs=()):
+        self.workers = workers
+        self.initializer, self.initargs = initializer, initargs
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _current(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                                     initializer=self.initializer, initargs=self.initargs)
+            return self._executor
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor: self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn, *args):
+        for retry in (False, True):
+            executor = self._current()
+            try: return executor, executor.submit(fn, *args)
+            except (BrokenProcessPool, RuntimeError):  # broken, or shut down: once more on a fresh executor
+                self._discard(executor)
+                if retry: raise
+
+    def submit(self, fn, *args):
+        return self._submit(fn, *args)[1]
+
+    def map(self, fn, *iterables):
+        """Like ``Executor.map``. If a worker dies, the pool is replaced and BrokenProcessPool is raised."""
+        return self._results([self._submit(fn, *args) for args in zip(*iterables)])
+
+    def _results(self, submitted):
+        try:
+            for executor, fut in submitted:
+                try: yield fut.result()
+                except BrokenProcessPool:
+                    self._discard(executor)
+                    raise
+        finally:
+            for _, fut in submitted: fut.cancel()
+
+    def shutdown(self, wait=True):
+        with self._lock: executor, self._executor = self._executor, None
+        if executor: executor.shutdown(wait=wait, cancel_futures=True)
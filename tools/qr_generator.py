@@ -0,0 +1,137 @@
+import streamlit as st
+import csv
+import io
+import os
+import re
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import repeat
+
+from tools import artifacts
+from tools.config import setting
+from tools.delivery import file_download
+from tools.export import encode, encoder_options, file_name, mime_type
+from tools.pools import WORKER_CRASHED, SharedPool
+
+try:
+    import qrcode
+    import qrcode.image.svg
+except ImportError:
+    qrcode = None
+
+EC_LEVELS = {"L (7%)": "L", "M (15%)": "M", "Q (25%)": "Q", "H (30%)": "H"}
+QR_WORKERS = setting("QR_WORKERS", min(4, os.cpu_count() or 1), int)
+BULK_CHUNK = 64
+
+
+def _qr(content, box_size, ec):
+    qr = qrcode.QRCode(box_size=box_size, border=5, error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{ec}"))
+    qr.add_data(content)
+    qr.make(fit=True)
+    return qr
+
+
+@lru_cache(maxsize=1024)
+def qr_image(content, color, box_size=10, ec="M"):
+    """PIL image of a QR code, cached on (content, color, box size, error correction).
+
+    Callers must not modify the returned image.
+    """
+    return _qr(content, box_size, ec).make_image(fill_color=color, back_color="white").get_image()
+
+
+@lru_cache(maxsize=16)
+def _svg_factory(color):
+    style = {**qrcode.image.svg.SvgPathImage.QR_PATH_STYLE, "fill": color}
+    return type("ColoredSvgImage", (qrcode.image.svg.SvgPathFillImage,), {"QR_PATH_STYLE": style})
+
+
+@lru_cache(maxsize=1024)
+def qr_svg(content, color, box_size=10, ec="M"):
+    """Vector QR code as SVG bytes, with the same cache key as ``qr_image``."""
+    buf = io.BytesIO()
+    _qr(content, box_size, ec).make_image(image_factory=_svg_factory(color)).save(buf)
+    return buf.getvalue()
+
+
+def render_qr(content, color, box_size, ec, options):
+    """(bytes, extension) for one code; ``options`` is an encoder dict or "SVG"."""
+    if options == "SVG": return qr_svg(content, color, box_size, ec), "svg"
+    return encode(qr_image(content, color, box_size, ec), options), file_name("", options)[1:]
+
+
+def _render_chunk(rows, color, box_size, ec, options):
+    return [(name, *render_qr(content, color, box_size, ec, options)) for name, content in rows]
+
+
+@st.cache_resource
+def get_pool():
+    return SharedPool(QR_WORKERS)
+
+
+def read_payloads(upload):
+    """(file stem, content) pairs from a CSV: a ``content`` column (else the first), optional ``filename``."""
+    rows = list(csv.reader(io.TextIOWrapper(upload, encoding="utf-8-sig")))
+    if not rows: return []
+    header = [h.strip().lower() for h in rows[0]]
+    if "content" in header:
+        ci, ni, rows = header.index("content"), header.index("filename") if "filename" in header else None, rows[1:]
+    else: ci, ni = 0, None
+    out, seen = [], set()
+    for k, r in enumerate(rows, 1):
+        if len(r) <= ci or not r[ci].strip(): continue
+        stem = re.sub(r"[^\w.-]+", "_", r[ni].strip()) if ni is not None and len(r) > ni and r[ni].strip() else f"qr_{k:05d}"
+        while stem in seen: stem += "_"
+        seen.add(stem)
+        out.append((stem, r[ci].strip()))
+    return out
+
+
+def render_bulk(color, box_size, ec, options):
+    up = st.file_uploader("CSV of payloads", type="csv", help="A `content` column (or the first column), plus an optional `filename` column.")
+    if up and st.button("Generate All"):
+        rows = read_payloads(up)
+        if not rows:
+            st.warning("No payloads found.")
+            return
+        bar = st.progress(0.0, text=f"0 / {len(rows)}")
+        out_path = artifacts.new_path("qr", "qr_codes.zip")
+        chunks = [rows[i:i + BULK_CHUNK] for i in range(0, len(rows), BULK_CHUNK)]
+        # Small jobs aren't worth starting worker processes for
+        if len(chunks) > 1:
+            results = get_pool().map(_render_chunk, chunks, repeat(color), repeat(box_size), repeat(ec), repeat(options))
+        else: results = [_render_chunk(rows, color, box_size, ec, options)]
+        done = 0
+        try:
+            with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED if options == "SVG" else zipfile.ZIP_STORED) as zf:
+                for chunk in results:
+                    for name, data, ext in chunk: zf.writestr(f"{name}.{ext}", data)
+                    done += len(chunk)
+                    bar.progress(done / len(rows), text=f"{done} / {len(rows)}")
+        except BrokenProcessPool:
+            st.error(WORKER_CRASHED)
+            return
+        st.session_state.qr_bulk = out_path
+    if st.session_state.get("qr_bulk") and os.path.isfile(st.session_state.qr_bulk):
+        file_download("⬇️ Download ZIP", st.session_state.qr_bulk)
+
+
+def render():
+    st.markdown("<h1 class='main-title'>QR Code Generator</h1>", unsafe_allow_html=True)
+    if qrcode is None: st.error("⚠️ `qrcode` library missing.")
+    else:
+        bulk = st.radio("Mode", ["Single", "Bulk (CSV)"], horizontal=True) != "Single"
+        if not bulk: txt = st.text_input("Content", "https://example.com")
+        c1, c2, c3 = st.columns(3)
+        with c1: col = st.color_picker("Color", "#000000")
+        with c2: box_size = st.slider("Box Size", 2, 20, 10)
+        with c3: ec = EC_LEVELS[st.selectbox("Error Correction", list(EC_LEVELS), index=1)]
+        with st.expander("Export options"):
+            options = "SVG" if st.checkbox("Vector (SVG)") else encoder_options("qr")
+        if bulk:
+            render_bulk(col, box_size, ec, options)
+        elif st.button("Generate"):
+            st.image(qr_image(txt, col, box_size, ec), width=250)
+            data, ext = render_qr(txt, col, box_size, ec, options)
+            st.download_button("Download", data, f"qr.{ext}", "image/svg+xml" if options == "SVG" else mime_type(options))
@@ -0,0 +1,75 @@
+import streamlit as st
+import html
+import os
+from datetime import datetime
+
+from tools.config import setting
+from tools.notes_store import HIT_END, HIT_START, NotesStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NOTES_DB = setting("NOTES_DB", os.path.join(ROOT, "data", "notes.db"))
+PAGE_SIZE = 20
+
+
+@st.cache_resource
+def get_store():
+    return NotesStore(NOTES_DB)
+
+
+def _when(created):
+    return datetime.fromisoformat(created).astimezone().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _body_html(body):
+    # Escape first, then turn the search hit markers into <mark>
+    text = html.escape(body).replace(HIT_START, "<mark>").replace(HIT_END, "</mark>")
+    return text.replace("\n", "<br>")
+
+
+def render_note(store, note):
+    c1, c2 = st.columns([12, 1])
+    with c1:
+        tags = " ".join(f"<code>#{html.escape(t)}</code>" for t in note["tags"])
+        st.markdown(f"<div style='background:white; padding:15px; border-radius:10px; margin-bottom:10px; border-left:5px solid #ff4b4b; box-shadow:0 2px 5px rgba(0,0,0,0.05);'>"
+                    f"<small style='color:#888'>{_when(note['created'])}</small> {tags}<br>{_body_html(note['body'])}</div>", unsafe_allow_html=True)
+    with c2:
+        if st.button("🗑️", key=f"note_del_{note['id']}", help="Delete note"):
+            store.delete(note["id"])
+            st.rerun()
+
+
+def render():
+    st.markdown("<h1 class='main-title'>Quick Notes</h1>", unsafe_allow_html=True)
+    st.caption("Notes are saved on the server and shared by everyone using this app.")
+    store = get_store()
+
+    with st.form("note", clear_on_submit=True):
+        txt = st.text_area("New Note")
+        tags = st.text_input("Tags", placeholder="work, ideas (#hashtags in the note count too)")
+        if st.form_submit_button("Save"):
+            if txt.strip():
+                store.add(txt.strip(), tags)
+                st.success("Saved")
+            else: st.warning("Note is empty.")
+
+    c1, c2 = st.columns([3, 1])
+    with c1: query = st.text_input("🔍 Search notes")
+    with c2:
+        tag_counts = dict(store.tags())
+        tag = st.selectbox("Tag", ["All", *tag_counts],
+                           format_func=lambda t: t if t == "All" else f"#{t} ({tag_counts[t]})")
+    tag = None if tag == "All" else tag
+
+    total = store.count(query, tag)
+    if not total:
+        st.info("No matching notes." if query or tag else "No notes yet.")
+        return
+    pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+    if pages > 1:
+        c1, c2 = st.columns([1, 3])
+        with c1: page = st.number_input(f"Page (of {pages:,})", 1, pages, 1)
+        with c2: st.caption(f"{total:,} notes" + (", best match first" if query else ", newest first"))
+    else: page = 1
+    # Only one page is ever queried and rendered
+    for note in store.page(PAGE_SIZE, (page - 1) * PAGE_SIZE, query, tag):
+        render_note(store, note)
@@ -0,0 +1,116 @@
+import streamlit as st
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+from tools import artifacts
+from tools.config import setting
+from tools.delivery import file_download
+from tools.pools import WORKER_CRASHED, SharedPool
+from tools.resume_engine import FPDF, get_template, needs_unicode, pdf_name, read_candidates, render_batch
+
+RESUME_FONT = setting("RESUME_FONT")
+RESUME_WORKERS = setting("RESUME_WORKERS", min(4, os.cpu_count() or 1), int)
+
+
+@st.cache_resource
+def get_pool():
+    return SharedPool(RESUME_WORKERS)
+
+
+def font_notice(tpl, candidates):
+    if not tpl.unicode and any(needs_unicode(c) for c in candidates):
+        st.info("No Unicode font found, so characters outside Latin-1 were transliterated. "
+                "Install DejaVu Sans or set `RESUME_FONT` to a TTF file.")
+
+
+def render_batch_mode():
+    up = st.file_uploader("Candidates (JSON or CSV)", type=["json", "csv"],
+                          help="A JSON list of candidates or a CSV with one row each. `experience` / `education` "
+                               "take JSON arrays, or use numbered columns such as `exp_role_2`, `edu_degree_2`.")
+    if up and st.button("📄 Generate All Resumes"):
+        try: candidates = read_candidates(up.name, up.getvalue())
+        except ValueError as e:
+            st.error(f"Could not read {up.name}: {e}")
+            return
+        if not candidates:
+            st.warning("No candidates found.")
+            return
+        bar = st.progress(0.0, text=f"0 / {len(candidates)}")
+        out_path = artifacts.new_path("resume", "resumes.zip")
+        try:
+            rows = render_batch(candidates, out_path, RESUME_FONT, get_pool() if len(candidates) > 16 else None,
+                                on_done=lambda i, n: bar.progress(i / n, text=f"{i} / {n}"))
+        except BrokenProcessPool:
+            st.error(WORKER_CRASHED)
+            return
+        ok = sum(r["Status"] == "OK" for r in rows)
+        st.success(f"Generated {ok}/{len(rows)} resumes.")
+        if ok < len(rows): st.dataframe([r for r in rows if r["Status"] != "OK"], use_container_width=True)
+        font_notice(get_template(RESUME_FONT), candidates)
+        st.session_state.resume_batch = out_path
+    if st.session_state.get("resume_batch") and os.path.isfile(st.session_state.resume_batch):
+        file_download("⬇️ Download ZIP", st.session_state.resume_batch)
+
+
+def render():
+    st.markdown("<h1 class='main-title'>Professional Resume Builder</h1>", unsafe_allow_html=True)
+    if FPDF is None: st.error("⚠️ `fpdf` library missing.")
+    elif st.radio("Mode", ["Single", "Batch (JSON/CSV)"], horizontal=True) != "Single":
+        render_batch_mode()
+    else:
+        # Entry counts live outside the form so changing them redraws it right away
+        c1, c2 = st.columns(2)
+        with c1: n_exp = st.number_input("Experience entries", 1, 10, 1)
+        with c2: n_edu = st.number_input("Education entries", 1, 5, 1)
+        with st.form("resume_form"):
+            st.subheader("1. Contact Information")
+            c1, c2 = st.columns(2)
+            with c1:
+                name = st.text_input("Full Name")
+                email = st.text_input("Email Address")
+                linkedin = st.text_input("LinkedIn Profile URL")
+            with c2:
+                phone = st.text_input("Phone Number")
+                location = st.text_input("City, Country")
+                role_title = st.text_input("Target Job Title")
+
+            st.markdown("---")
+            st.subheader("2. Professional Summary")
+            summary = st.text_area("Brief Bio", height=100, placeholder="Experienced professional with...")
+
+            st.markdown("---")
+            st.subheader("3. Experience (Latest First)")
+            experience = []
+            for i in range(n_exp):
+                if i: st.markdown(f"**Role {i + 1}**")
+                exp = {"role": st.text_input("Job Title", key=f"exp_role_{i}"),
+                       "company": st.text_input("Company Name", key=f"exp_company_{i}")}
+                c3, c4 = st.columns(2)
+                with c3: exp["start"] = st.text_input("Start Date", key=f"exp_start_{i}")
+                with c4: exp["end"] = st.text_input("End Date", key=f"exp_end_{i}")
+                exp["description"] = st.text_area("Job Description", height=150, key=f"exp_desc_{i}")
+                experience.append(exp)
+
+            st.markdown("---")
+            st.subheader("4. Education")
+            education = []
+            for i in range(n_edu):
+                if i: st.markdown(f"**Qualification {i + 1}**")
+                education.append({"degree": st.text_input("Degree", key=f"edu_degree_{i}"),
+                                  "university": st.text_input("University", key=f"edu_uni_{i}"),
+                                  "year": st.text_input("Graduation Year", key=f"edu_year_{i}")})
+
+            st.markdown("---")
+            st.subheader("5. Skills")
+            skills = st.text_area("List your skills (comma separated)")
+
+            submitted = st.form_submit_button("📄 Generate Professional Resume")
+
+        if submitted:
+            candidate = {"name": name, "email": email, "phone": phone, "location": location, "linkedin": linkedin,
+                         "role_title": role_title, "summary": summary, "experience": experience,
+                         "education": education, "skills": skills}
+            tpl = get_template(RESUME_FONT)
+            st.success("Resume Generated Successfully!")
+            font_notice(tpl, [candidate])
+            st.download_button("⬇️ Download PDF", tpl.render(candidate), pdf_name(candidate), "application/pdf")
@@ -0,0 +1,364 @@
+"""Resume PDF rendering for the Resume Builder, kept free of UI code.
+
+A ``ResumeTemplate`` settles fonts, colours and section order once; rendering
+a candidate then only walks their data. Templates are cached per process (one
+per font). On fpdf 1.7.2 (the pinned version) parsed TrueType metrics and
+embedded font subsets are cached too: fpdf re-reads the TTF on every
+``add_font`` and every subset, so those results are kept and reused (behind a
+lock, since sessions render on several threads at once).
+
+Text is Unicode end to end when a TTF font with wide coverage (DejaVu Sans,
+or any file given as ``font``) is available. Without one, fpdf's core fonts
+only cover Latin-1, so other characters are transliterated (smart quotes,
+dashes, accented letters) or replaced with ``?`` rather than dropped.
+"""
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+import zipfile
+from functools import lru_cache
+from itertools import repeat
+
+try:
+    import fpdf
+    from fpdf import FPDF
+except ImportError:
+    FPDF = None
+
+# fpdf pickles parsed TTF metrics next to the font file by default; keep them out of font dirs
+FONT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "utility_apps_fonts")
+if FPDF is not None and hasattr(fpdf, "set_global"):
+    fpdf.set_global("FPDF_CACHE_MODE", 2)
+    fpdf.set_global("FPDF_CACHE_DIR", FONT_CACHE_DIR)
+
+FONT_CANDIDATES = [
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "fonts", "DejaVuSans.ttf"),
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/Library/Fonts/DejaVuSans.ttf",
+    "C:/Windows/Fonts/DejaVuSans.ttf",
+]
+# Suffixes tried next to the regular face for the bold and italic variants
+STYLE_SUFFIXES = {"B": ("-Bold", "bd", "-bold"), "I": ("-Oblique", "-Italic", "i", "-italic")}
+
+EXP_FIELDS = {"role": "role", "company": "company", "start": "start", "end": "end", "desc": "description", "description": "description"}
+EDU_FIELDS = {"degree": "degree", "uni": "university", "university": "university", "year": "year"}
+
+
+# --- Fonts and text ---
+
+def find_font(font=None):
+    """Path of a Unicode TTF: ``font`` if it exists, else the first DejaVu Sans found, else None."""
+    for path in ([font] if font else []) + FONT_CANDIDATES:
+        if path and os.path.isfile(path): return path
+    return None
+
+
+def _style_variant(path, style):
+    stem, ext = os.path.splitext(path)
+    for suffix in STYLE_SUFFIXES[style]:
+        if os.path.isfile(stem + suffix + ext): return stem + suffix + ext
+    return path
+
+
+_TRANSLIT = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201a": ",", "\u201c": '"', "\u201d": '"', "\u201e": '"',
+    "\u2013": "-", "\u2014": "-", "\u2212": "-", "\u2022": "\u00b7", "\u2026": "...", "\u00a0": " ",
+    "\u20ac": "EUR", "\u2122": "(TM)", "\u0141": "L", "\u0142": "l", "\u0110": "D", "\u0111": "d",
+    "\u0152": "OE", "\u0153": "oe",
+})
+
+
+@lru_cache(maxsize=4096)
+def to_latin1(text):
+    """Closest Latin-1 rendering of ``text``: typographic marks and accents are folded, the rest become ``?``."""
+    try:
+        text.encode("latin-1")
+        return text
+    except UnicodeEncodeError: pass
+    out = []
+    for ch in text.translate(_TRANSLIT):
+        if ord(ch) < 256: out.append(ch)
+        else:
+            base = "".join(c for c in unicodedata.normalize("NFKD", ch) if not unicodedata.combining(c))
+            out.append(base if base and all(ord(c) < 256 for c in base) else "?")
+    return "".join(out)
+
+
+def needs_unicode(value):
+    """True if any string in ``value`` (nested dicts/lists) falls outside Latin-1."""
+    if isinstance(value, str): return any(ord(c) > 255 for c in value)
+    if isinstance(value, dict): value = list(value.values())
+    return isinstance(value, list) and any(needs_unicode(v) for v in value)
+
+
+# Glyphs embedded in every document, so most resumes share one font subset (see _SubsetCache)
+BASE_GLYPHS = list(range(32, 127)) + [0x2013, 0x2014, 0x2018, 0x2019, 0x201C, 0x201D, 0x2022, 0x2026, 0x20AC]
+SUBSET_CACHE_SIZE = 64
+# The speed-ups below reach into fpdf 1.7.2 internals (requirements.txt pins it);
+# any other version, or a 1.7.2 without the hooks they use, gets plain FPDF:
+# the same output, just slower
+FPDF_INTERNALS = (FPDF is not None and getattr(fpdf, "FPDF_VERSION", None) == "1.7.2"
+                  and hasattr(getattr(fpdf.fpdf, "TTFontFile", None), "makeSubset")
+                  and "TTFontFile" in FPDF._putfonts.__code__.co_names)
+
+if FPDF_INTERNALS:
+    import types
+
+    _font_lock = threading.Lock()  # guards the class-level caches below
+
+    class _SubsetCache(fpdf.fpdf.TTFontFile):
+        """TTFontFile that memoizes embedded subsets per (font file, glyph set).
+
+        Building a subset re-reads and checksums the whole TTF, which is
+        most of the cost of each document; fpdf only reads ``codeToGlyph``
+        and ``maxUni`` back afterwards, so those are cached with the bytes.
+        """
+        _cache = {}
+
+        def makeSubset(self, file, subset):
+            key = (file, frozenset(subset))
+            with _font_lock: hit = self._cache.get(key)
+            if hit is None:
+                data = super().makeSubset(file, subset)
+                hit = (data, self.codeToGlyph, self.maxUni)
+                with _font_lock:
+                    if key not in self._cache and len(self._cache) >= SUBSET_CACHE_SIZE: self._cache.pop(next(iter(self._cache)))
+                    self._cache[key] = hit
+            data, self.codeToGlyph, self.maxUni = hit
+            return data
+
+    class _GlyphList(list):
+        """fpdf's per-font list of used code points, with a set-backed ``in``.
+
+        fpdf appends every character drawn (duplicates included) and then tests
+        membership once per code point in the font while writing widths.
+        """
+        _seen, _seen_len = frozenset(), 0
+
+        def __contains__(self, code):
+            if self._seen_len != len(self): self._seen, self._seen_len = frozenset(self), len(self)
+            return code in self._seen
+
+    class _PDF(FPDF):
+        """FPDF that parses each TrueType font once per process and reuses font subsets.
+
+        Only this class is affected: ``fpdf.fpdf`` and other FPDF users are untouched.
+        """
+        _fonts = {}  # (family, style, path) -> (fonts entry, font_files entries)
+
+        # _putfonts looks TTFontFile up in fpdf.fpdf's globals; this copy of it
+        # sees _SubsetCache instead, without patching the module
+        _putfonts = types.FunctionType(FPDF._putfonts.__code__, {**vars(fpdf.fpdf), "TTFontFile": _SubsetCache}, "_putfonts")
+
+        def add_font(self, family, style="", fname="", uni=False):
+            key = (family.lower(), style.upper(), fname)
+            fontkey = key[0] + key[1]
+            with _font_lock: cached = self._fonts.get(key)
+            if cached is None:
+                os.makedirs(FONT_CACHE_DIR, exist_ok=True)
+                before = set(self.font_files)
+                super().add_font(family, style, fname, uni)
+                cached = (dict(self.fonts[fontkey]), {k: dict(self.font_files[k]) for k in set(self.font_files) - before})
+                with _font_lock: self._fonts[key] = cached
+            elif fontkey not in self.fonts:
+                entry, files = cached
+                # Each document tracks its own glyph subset, so only that list is fresh;
+                # its seed mirrors FPDF.add_font in 1.7.2
+                self.fonts[fontkey] = {**entry, "i": len(self.fonts) + 1, "subset": _GlyphList(range(0, 57 if hasattr(self, "str_alias_nb_pages") else 32))}
+                self.font_files.update({k: dict(v) for k, v in files.items()})
+            if uni: self.fonts[fontkey]["subset"] = _GlyphList(self.fonts[fontkey]["subset"] + BASE_GLYPHS)
+else:
+    _PDF = FPDF
+
+
+# --- Candidate data ---
+
+def _entries(value, fields):
+    """List of entry dicts from a list or a JSON array string, with keys mapped through ``fields``."""
+    if isinstance(value, str):
+        value = value.strip()
+        if not value: return []
+        value = json.loads(value)
+    if isinstance(value, dict): value = [value]
+    return [{fields.get(k, k): str(v or "").strip() for k, v in e.items()} for e in value or [] if isinstance(e, dict)]
+
+
+def normalize(record):
+    """Candidate dict with every field the template reads.
+
+    Experience and education may be lists of dicts, JSON arrays, or flat
+    ``exp_role`` / ``edu_degree`` keys (as in the form), optionally numbered:
+    ``exp_role_2``, ``edu_uni_2``.
+    """
+    rec = {str(k).strip().lower(): v for k, v in record.items() if k is not None}
+    exp, edu = _entries(rec.get("experience"), EXP_FIELDS), _entries(rec.get("education"), EDU_FIELDS)
+    flat = {}
+    for k, v in rec.items():
+        m = re.fullmatch(r"(exp|edu)_([a-z]+)(?:_(\d+))?", k)
+        if m and v not in (None, ""):
+            fields = EXP_FIELDS if m.group(1) == "exp" else EDU_FIELDS
+            if m.group(2) in fields: flat.setdefault((m.group(1), int(m.group(3) or 1)), {})[fields[m.group(2)]] = str(v).strip()
+    for (kind, _), entry in sorted(flat.items()): (exp if kind == "exp" else edu).append(entry)
+    skills = rec.get("skills") or ""
+    if isinstance(skills, list): skills = ", ".join(map(str, skills))
+    out = {k: str(rec.get(k) or "").strip() for k in ("name", "email", "phone", "location", "linkedin", "summary")}
+    out["role_title"] = str(rec.get("role_title") or rec.get("title") or "").strip()
+    out["skills"] = str(skills).strip()
+    out["experience"] = [e for e in exp if e.get("role") or e.get("company")]
+    out["education"] = [e for e in edu if e.get("degree") or e.get("university")]
+    return out
+
+
+def read_candidates(name, data):
+    """Normalized candidates from a JSON (list, ``{"candidates": [...]}`` or one object) or CSV upload."""
+    text = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+    if name.lower().endswith(".json"):
+        records = json.loads(text)
+        if isinstance(records, dict): records = records.get("candidates", [records])
+    else:
+        records = list(csv.DictReader(io.StringIO(text)))
+    return [normalize(r) for r in records]
+
+
+def pdf_name(candidate, seen=None):
+    stem = re.sub(r"[^\w.-]+", "_", candidate.get("name") or "", flags=re.UNICODE).strip("_") or "candidate"
+    name = f"{stem}_Resume.pdf"
+    if seen is not None:
+        k = 1
+        while name in seen:
+            k += 1
+            name = f"{stem}_{k}_Resume.pdf"
+        seen.add(name)
+    return name
+
+
+# --- Template ---
+
+class ResumeTemplate:
+    """Fixed layout for rendering any number of resumes.
+
+    ``font`` is a TTF path; it and its bold/italic siblings are used when
+    found, otherwise the core Arial font with Latin-1 transliteration.
+    """
+
+    def __init__(self, font=None, fill=(230, 230, 230), muted=(100, 100, 100)):
+        self.font_path = find_font(font)
+        self.unicode = self.font_path is not None
+        self.family = "ResumeSans" if self.unicode else "Arial"
+        self.fill, self.muted = fill, muted
+        self.text = str if self.unicode else to_latin1
+        self.sections = [self._summary, self._experience, self._education, self._skills]
+        if self.unicode: self._faces = [(s, self.font_path if not s else _style_variant(self.font_path, s)) for s in ("", "B", "I")]
+
+    def _new_pdf(self):
+        pdf = _PDF()
+        if self.unicode:
+            for style, path in self._faces: pdf.add_font(self.family, style, path, uni=True)
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+        return pdf
+
+    def _heading(self, pdf, title):
+        pdf.set_font(self.family, "B", 12)
+        pdf.set_fill_color(*self.fill)
+        pdf.cell(0, 8, self.text(title.upper()), ln=1, fill=True)
+        pdf.ln(2)
+
+    def _block(self, pdf, title, content):
+        if content:
+            self._heading(pdf, title)
+            pdf.set_font(self.family, "", 11)
+            pdf.multi_cell(0, 5, self.text(content))
+            pdf.ln(5)
+
+    def _header(self, pdf, c):
+        pdf.set_font(self.family, "B", 26)
+        pdf.cell(0, 10, self.text(c["name"]), ln=1)
+        pdf.set_font(self.family, "I", 14)
+        pdf.set_text_color(*self.muted)
+        pdf.cell(0, 8, self.text(c["role_title"]), ln=1)
+        pdf.set_font(self.family, "", 10)
+        pdf.set_text_color(0, 0, 0)
+        contact = " | ".join(v for v in (c["email"], c["phone"], c["location"], c["linkedin"]) if v)
+        pdf.cell(0, 8, self.text(contact), ln=1, border="B")
+        pdf.ln(5)
+
+    def _summary(self, pdf, c):
+        self._block(pdf, "Professional Summary", c["summary"])
+
+    def _experience(self, pdf, c):
+        if not c["experience"]: return
+        self._heading(pdf, "Experience")
+        for k, e in enumerate(c["experience"]):
+            if k: pdf.ln(3)
+            pdf.set_font(self.family, "B", 11)
+            pdf.cell(100, 6, self.text(" at ".join(v for v in (e.get("role"), e.get("company")) if v)))
+            pdf.set_font(self.family, "I", 11)
+            pdf.cell(0, 6, self.text(" - ".join(v for v in (e.get("start"), e.get("end")) if v)), ln=1, align="R")
+            if e.get("description"):
+                pdf.set_font(self.family, "", 11)
+                pdf.multi_cell(0, 5, self.text(e["description"]))
+        pdf.ln(5)
+
+    def _education(self, pdf, c):
+        lines = []
+        for e in c["education"]:
+            where = e.get("university", "") + (f" ({e['year']})" if e.get("year") else "")
+            lines.append("\n".join(v for v in (e.get("degree"), where) if v))
+        self._block(pdf, "Education", "\n\n".join(lines))
+
+    def _skills(self, pdf, c):
+        self._block(pdf, "Skills", c["skills"])
+
+    def render(self, candidate):
+        """PDF bytes for one candidate (any dict accepted by ``normalize``)."""
+        c = normalize(candidate)
+        pdf = self._new_pdf()
+        self._header(pdf, c)
+        for section in self.sections: section(pdf, c)
+        out = pdf.output(dest="S")
+        # fpdf 1.7 returns the document as a Latin-1 str; fpdf2 returns bytes
+        return bytes(out) if isinstance(out, (bytes, bytearray)) else out.encode("latin-1")
+
+
+@lru_cache(maxsize=4)
+def get_template(font=None):
+    """Per-process template for ``font``, shared by the UI thread and worker processes."""
+    return ResumeTemplate(font)
+
+
+# --- Batches ---
+
+def _render_chunk(candidates, font):
+    tpl, out = get_template(font), []
+    for c in candidates:
+        try: out.append((tpl.render(c), None))
+        except Exception as e: out.append((None, str(e)))
+    return out
+
+
+def render_batch(candidates, out_zip, font=None, pool=None, chunk=16, on_done=None):
+    """Render every candidate into ``out_zip``; return one status row per candidate.
+
+    With ``pool`` the candidates are spread across worker processes in chunks,
+    and results are written in order as each chunk completes.
+    """
+    chunks = [candidates[i:i + chunk] for i in range(0, len(candidates), chunk)]
+    if pool is None or len(chunks) < 2: results = (_render_chunk(c, font) for c in chunks)
+    else: results = pool.map(_render_chunk, chunks, repeat(font))
+    rows, seen = [], set()
+    with zipfile.ZipFile(out_zip, "w", zipfile.ZIP_DEFLATED) as zf:
+        for part, res in zip(chunks, results):
+            for c, (data, err) in zip(part, res):
+                name = pdf_name(c, seen)
+                if data is not None: zf.writestr(name, data)
+                rows.append({"File": name, "Status": err or "OK"})
+            if on_done: on_done(len(rows), len(candidates))
+    return rows
@@ -0,0 +1,32 @@
+"""Shared SQLite plumbing for the app's persistent stores.
+
+Each store is one WAL-mode database file, so readers don't block the writer,
+with one connection per thread because Streamlit reruns may land on
+different threads. There is no notion of a user: everyone using the app
+shares the same database.
+"""
+import os
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    """Base for a store backed by the database at ``path``, created with ``schema``."""
+
+    PRAGMAS = ("journal_mode=WAL", "synchronous=NORMAL")
+
+    def __init__(self, path, schema):
+        self.path = path
+        self._local = threading.local()
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.conn: self.conn.executescript(schema)
+
+    @property
+    def conn(self):
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            for pragma in self.PRAGMAS: conn.execute(f"PRAGMA {pragma}")
+            self._local.conn = conn
+        return conn
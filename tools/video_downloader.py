@@ -0,0 +1,63 @@
+import streamlit as st
+import os
+
+from tools.config import setting
+from tools.delivery import file_download
+from tools.download_queue import DownloadQueue
+
+try:
+    import yt_dlp
+except ImportError:
+    yt_dlp = None
+
+MAX_JOBS = setting("DOWNLOAD_MAX_JOBS", 2, int)
+FRAGMENTS = setting("DOWNLOAD_FRAGMENTS", 4, int)
+MAX_AGE_H = setting("DOWNLOAD_MAX_AGE_HOURS", 24, float)
+MAX_DIR_MB = setting("DOWNLOAD_MAX_DIR_MB", 5000, int)
+
+
+@st.cache_resource
+def get_queue():
+    """Process-wide queue, so jobs keep running (and stay visible) across reruns."""
+    return DownloadQueue(yt_dlp.YoutubeDL, "downloads", MAX_JOBS, FRAGMENTS)
+
+
+def _fmt_mb(n):
+    return f"{n / 1e6:.1f} MB" if n else "?"
+
+
+def _progress_line(job):
+    speed = f" · {job.speed / 1e6:.1f} MB/s" if job.speed else ""
+    return f"{job.url} — {job.status} · {_fmt_mb(job.downloaded)} / {_fmt_mb(job.total)}{speed}"
+
+
+@st.fragment(run_every=1.0)
+def active_jobs(queue, ids):
+    jobs = [queue.get(i) for i in ids]
+    if not any(j and j.active for j in jobs):
+        st.rerun()  # everything finished: full rerun to show the download buttons
+    for job in jobs:
+        if job and job.active: st.progress(job.progress, text=_progress_line(job))
+
+
+def render():
+    st.markdown("<h1 class='main-title'>Video Downloader</h1>", unsafe_allow_html=True)
+    if yt_dlp is None: st.error("⚠️ `yt-dlp` missing.")
+    else:
+        queue = get_queue()
+        ids = st.session_state.setdefault("download_jobs", [])
+        url = st.text_input("YouTube URL")
+        mode = st.radio("Format", ["Video (MP4)", "Audio (M4A)"], horizontal=True)
+        if st.button("Download") and url:
+            queue.cleanup(MAX_AGE_H * 3600, MAX_DIR_MB * 1024 * 1024)
+            fmt = 'bestvideo+bestaudio/best' if "Video" in mode else 'bestaudio/best'
+            ids.append(queue.submit(url, fmt).id)
+
+        # Read each job once: another session's cleanup can drop it at any time
+        jobs = [job for job in map(queue.get, ids) if job]
+        ids[:] = [job.id for job in jobs]
+        if any(job.active for job in jobs): active_jobs(queue, list(ids))
+        for job in reversed(jobs):
+            if job.status == "done":
+                file_download(f"⬇️ Save {os.path.basename(job.path)}", job.path, key=f"dl_{job.id}")
+            elif job.status == "error": st.error(f"{job.url}: {job.error}")
@@ -0,0 +1,72 @@
+import streamlit as st
+import time
+import pandas as pd
+
+from tools.config import setting
+from tools.instrumentation import watch
+from tools.weather_client import DEFAULT_BASE_URL, WeatherClient, WeatherError
+
+try:
+    import plotly.express as px
+except ImportError:
+    px = None
+
+API_KEY = setting("OPENWEATHER_API_KEY")
+BASE_URL = setting("WEATHER_BASE_URL", DEFAULT_BASE_URL)
+CACHE_TTL_S = setting("WEATHER_CACHE_TTL_S", 600, int)
+MAX_CITIES = 12
+
+
+@st.cache_resource
+def get_client():
+    """One client (session pool and city cache) for every browser session."""
+    client = WeatherClient(API_KEY, BASE_URL, CACHE_TTL_S)
+    watch("weather_client.cities", client)
+    return client
+
+
+def _age(result):
+    secs = int(time.time() - result["fetched"])
+    return "just now" if secs < 60 else f"{secs // 60} min ago"
+
+
+def render_single(client):
+    col1, col2 = st.columns([3, 1])
+    with col1: city = st.text_input("City", "New York")
+    with col2: btn = st.button("Check Weather")
+
+    if btn:
+        try: data = client.current(city)
+        except WeatherError as e:
+            st.error(str(e))
+            return
+        st.metric("Temperature", f"{data['temp']} °C", data["description"])
+        st.success(f"Humidity: {data['humidity']}% | Wind: {data['wind']} m/s")
+        st.caption(f"{data['city']} {data['country']} · updated {_age(data)}")
+
+
+def render_compare(client):
+    text = st.text_input("Cities (comma separated)", "London, Paris, Tokyo, New York")
+    if st.button("Compare"):
+        cities = list(dict.fromkeys(c.strip() for c in text.split(",") if c.strip()))[:MAX_CITIES]
+        results = client.many(cities)
+        rows = [{"City": f"{d['city']} {d['country']}".strip(), "Temp (°C)": d["temp"], "Feels Like (°C)": d["feels_like"],
+                 "Humidity (%)": d["humidity"], "Wind (m/s)": d["wind"], "Conditions": d["description"], "Updated": _age(d)}
+                for _, d, _ in results if d]
+        for city, _, err in results:
+            if err: st.warning(f"{city}: {err}")
+        if rows:
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+            if px is not None:
+                st.plotly_chart(px.bar(pd.DataFrame(rows), x="City", y="Temp (°C)", color="Temp (°C)", color_continuous_scale="RdBu_r"),
+                                use_container_width=True)
+
+
+def render():
+    st.markdown("<h1 class='main-title'>Weather Dashboard</h1>", unsafe_allow_html=True)
+    if not API_KEY and BASE_URL == DEFAULT_BASE_URL:
+        st.warning("Set `OPENWEATHER_API_KEY` in the environment or `.streamlit/secrets.toml`.")
+        return
+    client = get_client()
+    if st.radio("Mode", ["Single City", "Compare Cities"], horizontal=True) == "Single City": render_single(client)
+    else: render_compare(client)
@@ -0,0 +1,208 @@
+"""OpenWeatherMap client for the Weather tool.
+
+One client per process holds a pooled ``requests.Session`` (connect/read
+timeouts, retries with exponential backoff on connection errors, 429 and
+5xx) and a per-city TTL cache shared by every browser session. Concurrent
+lookups of the same city wait for a single request, so repeated checks within
+the TTL never reach the API. Unknown cities are cached briefly too, and the
+cache keeps at most ``max_entries`` cities, least recently used going first.
+
+``base_url`` is configurable, so the client runs against the bundled stub
+server for offline work and benchmarks:
+
+    python -m tools.weather_client [port]
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_BASE_URL = "https://api.openweathermap.org/data/2.5"
+TIMEOUT = (3.05, 10)  # (connect, read) seconds
+NOT_FOUND_TTL_S = 60
+
+
+class WeatherError(Exception):
+    """A lookup failed; the message is suitable for showing to the user."""
+
+
+class CityNotFound(WeatherError):
+    pass
+
+
+def _key(city):
+    return " ".join(city.lower().split())
+
+
+class WeatherClient:
+    """Current conditions by city name, cached for ``ttl`` seconds per city."""
+
+    def __init__(self, api_key=None, base_url=DEFAULT_BASE_URL, ttl=600, retries=3, backoff=0.5, workers=8,
+                 max_entries=1024):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.workers = workers
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",), respect_retry_after_header=True, raise_on_status=False)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=workers, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._cache = OrderedDict()  # city key -> (expires at, result or CityNotFound), oldest use first
+        self._lock = threading.Lock()
+        self._inflight = {}  # city key -> lock held while that city is being fetched
+        self.hits = self.misses = 0
+
+    def _cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None: return None
+        if entry[0] <= time.time():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key, result, ttl):
+        self._cache[key] = (time.time() + ttl, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries: self._cache.popitem(last=False)
+
+    def _fetch(self, city):
+        params = {"q": city, "units": "metric"}
+        if self.api_key: params["appid"] = self.api_key
+        try:
+            resp = self.session.get(f"{self.base_url}/weather", params=params, timeout=TIMEOUT)
+        except requests.RequestException as e:
+            raise WeatherError(f"Weather service unreachable ({type(e).__name__}).") from e
+        if resp.status_code == 404: return CityNotFound("City not found.")
+        if resp.status_code == 401: raise WeatherError("Weather API key missing or rejected.")
+        if resp.status_code == 429: raise WeatherError("Weather API rate limit reached; try again shortly.")
+        if not resp.ok: raise WeatherError(f"Weather service error (HTTP {resp.status_code}).")
+        try:
+            data = resp.json()
+            return {
+                "city": data.get("name") or city,
+                "country": data.get("sys", {}).get("country", ""),
+                "temp": data["main"]["temp"],
+                "feels_like": data["main"].get("feels_like"),
+                "humidity": data["main"]["humidity"],
+                "wind": data.get("wind", {}).get("speed"),
+                "description": data["weather"][0]["description"] if data.get("weather") else "",
+                "fetched": time.time(),
+            }
+        except (ValueError, KeyError, TypeError, IndexError, AttributeError) as e:
+            raise WeatherError("Weather service sent an unexpected response.") from e
+
+    def current(self, city):
+        """Conditions dict for ``city``; raises ``CityNotFound`` or ``WeatherError``."""
+        key = _key(city)
+        if not key: raise CityNotFound("Enter a city name.")
+        with self._lock:
+            result = self._cached(key)
+            if result is None: flight = self._inflight.setdefault(key, threading.Lock())
+        if result is None:
+            with flight:
+                with self._lock: result = self._cached(key)
+                if result is None:
+                    self.misses += 1
+                    try:
+                        result = self._fetch(city)
+                        ttl = NOT_FOUND_TTL_S if isinstance(result, CityNotFound) else self.ttl
+                        with self._lock: self._store(key, result, ttl)
+                    finally:
+                        with self._lock: self._inflight.pop(key, None)
+                else: self.hits += 1
+        else: self.hits += 1
+        if isinstance(result, Exception): raise result
+        return result
+
+    def many(self, cities):
+        """[(city, conditions or None, error message or None)] in input order, fetched concurrently."""
+        def one(city):
+            try: return city, self.current(city), None
+            except WeatherError as e: return city, None, str(e)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(cities)))) as pool:
+            return list(pool.map(one, cities))
+
+    def clear(self):
+        with self._lock: self._cache.clear()
+
+
+# --- Offline stub ---
+
+STUB_MISSING = {"atlantis", "el dorado"}
+STUB_RATE_LIMITED = "rate limited"  # city that always gets a 429
+STUB_GARBLED = "garbled"  # city that gets a 200 with a non-JSON body
+STUB_BAD_KEY = "bad-key"  # appid that gets a 401
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Minimal /weather endpoint returning deterministic conditions per city."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        city = query.get("q", [""])[0]
+        self.server.requests += 1
+        if query.get("appid") == [STUB_BAD_KEY]:
+            body, status = {"cod": 401, "message": "Invalid API key"}, 401
+        elif _key(city) == STUB_RATE_LIMITED:
+            body, status = {"cod": 429, "message": "rate limit exceeded"}, 429
+        elif _key(city) == STUB_GARBLED:
+            body, status = "<html>maintenance</html>", 200
+        elif not url.path.endswith("/weather") or not city.strip() or _key(city) in STUB_MISSING:
+            body, status = {"cod": "404", "message": "city not found"}, 404
+        else:
+            h = hashlib.sha1(_key(city).encode()).digest()
+            body, status = {
+                "name": city.strip().title(), "sys": {"country": "XX"},
+                "main": {"temp": round(h[0] / 255 * 45 - 10, 1), "feels_like": round(h[1] / 255 * 45 - 12, 1), "humidity": 20 + h[2] % 80},
+                "wind": {"speed": round(h[3] / 255 * 15, 1)},
+                "weather": [{"description": ["clear sky", "few clouds", "light rain", "overcast clouds", "snow"][h[4] % 5]}],
+            }, 200
+        data = (body if isinstance(body, str) else json.dumps(body)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args): pass
+
+
+class StubServer:
+    """Local stand-in for the API on ``port`` (0 picks a free one); ``.requests`` counts calls."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self.httpd.requests = 0
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}/data/2.5"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    import sys
+    stub = StubServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"Stub weather API at {stub.base_url}  (set WEATHER_BASE_URL to use it)")
+    try:
+        while True: time.sleep(3600)
+    except KeyboardInterrupt: stub.close()